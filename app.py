@@ -1,22 +1,18 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 import datetime
-import re
 import json
 import os
-import asyncio
-import edge_tts
-import pytz
 import streamlit.components.v1 as components
 import time
+import perf_metrics
+from schedule_core import KST, USAGE_KINDS, ScheduleBroadcast, SourceWatcher, delete_history, load_history_text, load_history_titles, load_schedule, page_locations, save_to_history, search_history, shorten_location, usage_keys, usage_summary
+from tts_cache import ANNOUNCE_GRACE_MS, announcement_schedule, get_tts_service
 
 # ==========================================
 # 1. 기본 설정 & CSS (배민 도현 + 완벽한 다크 모드)
 # ==========================================
 st.set_page_config(layout="wide", page_title="Seminar Schedule (Web) 🐾")
 
-KST = pytz.timezone('Asia/Seoul')
 
 now_init = datetime.datetime.now(KST)
 wkdays = ["월", "화", "수", "목", "금", "토", "일"]
@@ -129,195 +125,128 @@ st.markdown(
 )
 
 # ==========================================
-# 2. TTS 생성 및 보관함
+# 2. 보관함
 # ==========================================
-async def generate_tts_audio(text, filename="status_alert.mp3"):
-    try:
-        communicate = edge_tts.Communicate(text, "ko-KR-SunHiNeural")
-        await communicate.save(filename)
-    except: pass
-
-HISTORY_FILE = "schedule_history.json"
-
-def load_history():
-    if os.path.exists(HISTORY_FILE):
-        try:
-            with open(HISTORY_FILE, "r", encoding="utf-8") as f: return json.load(f)
-        except: return {}
-    return {}
-
-def save_to_history(text):
-    history = load_history()
-    first_line = text.split('\n')[0].strip()
-    match = re.search(r'(\d{1,2})\.(\d{1,2})\s*\(([월화수목금토일])\)', first_line)
-    if match: title = f"{match.group(1)}월 {match.group(2)}일 {match.group(3)}요일"
-    else: title = f"{first_line[:20]}... ({datetime.datetime.now(KST).strftime('%H:%M')})"
-    history[title] = text
-    with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-        json.dump(history, f, ensure_ascii=False, indent=4)
-
-def delete_history(key):
-    history = load_history()
-    if key in history:
-        del history[key]
-        with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-            json.dump(history, f, ensure_ascii=False, indent=4)
+@st.cache_resource
+def get_broadcast():
+    # 모든 세션이 공유하는 방송 스케줄 (운영자가 발행, 로비 화면은 수신)
+    return ScheduleBroadcast()
+
+@st.cache_resource
+def get_kiosk_state():
+    # 키오스크 스냅샷 켜짐 여부도 프로세스 전체에서 하나 (운영자 탭을 새로 열어도 체크 상태 유지)
+    return {"enabled": bool(os.environ.get("SEMINAR_KIOSK"))}
+
+def toggle_kiosk():
+    state = get_kiosk_state()
+    state["enabled"] = st.session_state['kiosk_enabled']
+    # plotly를 쓰는 스냅샷 모듈은 켤 때 처음 import
+    from kiosk_snapshot import get_kiosk_service
+    kiosk = get_kiosk_service(get_broadcast())
+    if state["enabled"]: kiosk.start()
+    else: kiosk.stop()
 
 def set_input_text(text):
     st.session_state['input_text'] = text
 
-# ==========================================
-# 3. 데이터 파싱
-# ==========================================
-def parse_time_str(time_str):
-    try:
-        time_str = time_str.replace(" ", "")
-        match = re.search(r'(\d{1,2})시(?:(\d{1,2})분)?', time_str)
-        if match:
-            hour = int(match.group(1))
-            minute = int(match.group(2)) if match.group(2) else 0
-            if 0 <= hour <= 23 and 0 <= minute <= 59:
-                return datetime.time(hour, minute)
-    except: return None
-    return None
-
-COLORS = {
-    "BLUE_MAIN": "#5E7CE2", "BLUE_SETUP": "#AAB8E8",  
-    "ORANGE_MAIN": "#E6A85E", "ORANGE_SETUP": "#F2D1A8", 
-    "GREEN_MAIN": "#76C48C", "GREEN_SETUP": "#B5E2C1", 
-    "GRAY_MAIN": "#9E9E9E", "GRAY_SETUP": "#E0E0E0"
-}
-PAST_COLOR = "#4A4A4A" 
-
-def shorten_location(loc_name):
-    match = re.search(r'(\d+)\s*([가-힣])', loc_name)
-    if match: return f"{match.group(1)}{match.group(2)}" 
-    return loc_name[:2]
-
-def get_color_for_location(loc_name, is_setup):
-    if "소" in loc_name: return COLORS["BLUE_SETUP"] if is_setup else COLORS["BLUE_MAIN"]
-    elif "세" in loc_name: return COLORS["ORANGE_SETUP"] if is_setup else COLORS["ORANGE_MAIN"]
-    elif "간" in loc_name: return COLORS["GREEN_SETUP"] if is_setup else COLORS["GREEN_MAIN"]
-    else: return COLORS["GRAY_SETUP"] if is_setup else COLORS["GRAY_MAIN"]
-
-def extract_schedule(raw_text):
-    schedule_data = []
-    js_events = [] 
-    today_kst = datetime.datetime.now(KST).date()
-    sections = re.split(r'={5,}', raw_text)
-    
-    for section in sections:
-        if not section.strip(): continue
-        lines = [l.strip() for l in section.strip().split('\n') if l.strip()]
-        data = { "date_obj": today_kst, "start": None, "setup": None, "end": None, "location": "미정", "staff": "", "office": "", "aide": "", "title": "", "simple_remark": "일반" }
-        
-        if len(lines) > 0:
-            line1 = lines[0]
-            date_match = re.search(r'(\d{1,2})\.(\d{1,2})', line1)
-            if date_match: 
-                try: data['date_obj'] = datetime.date(today_kst.year, int(date_match.group(1)), int(date_match.group(2)))
-                except ValueError: data['date_obj'] = today_kst
-
-            if '/' in line1:
-                times_part = line1.split(')')[-1] if ')' in line1 else line1
-                parts = times_part.split('/')
-                data['start'] = parse_time_str(parts[0])
-                if len(parts) > 1: data['setup'] = parse_time_str(parts[1])
-
-        if len(lines) > 1:
-            line2 = lines[1]
-            if '-' in line2: parts = line2.split('-'); data['location'] = parts[0].strip(); data['staff'] = parts[1].strip()
-            else: data['location'] = line2
-
-        if len(lines) > 2:
-            line3 = lines[2]
-            if '/' in line3: parts = line3.split('/'); data['office'] = parts[0].strip(); data['aide'] = parts[1].strip()
-            else: data['office'] = line3
-
-        if len(lines) > 3: data['title'] = lines[3]
-        if len(lines) > 4: 
-            raw_broadcast = "\n".join(lines[4:])
-            if "생중계" in raw_broadcast: data['simple_remark'] = "📡 생중계"
-            elif "녹화" in raw_broadcast: data['simple_remark'] = "📹 녹화"
-            else: data['simple_remark'] = "-"
-
-        if data['start'] and data['setup']:
-            try:
-                start_dt = KST.localize(datetime.datetime.combine(data['date_obj'], data['start']))
-                setup_dt = KST.localize(datetime.datetime.combine(data['date_obj'], data['setup']))
-                end_dt = start_dt + datetime.timedelta(hours=2)
-                
-                setup_color = get_color_for_location(data['location'], is_setup=True)
-                main_color = get_color_for_location(data['location'], is_setup=False)
-
-                broadcast_style = "color: #D32F2F; font-weight: bold;" if "생중계" in data['simple_remark'] else "color: #388E3C; font-weight: bold;"
-                
-                desc = f"""<div style='text-align: left; font-family: "Do Hyeon", sans-serif; font-size: 20px; line-height: 1.6; color: #000000; background-color: #ffffff; padding: 10px; border-radius: 5px;'>
-                    <span style='font-size: 22px; font-weight: bold; color: #FF007F;'>🐻 [{data['location']}]</span><br>
-                    <span>♥ 의원실: {data['office']}</span><br>
-                    <span>📝 제　목: {data['title']}</span><br>
-                    <span>⏰ 시　간: {setup_dt.strftime('%H:%M')} (셋팅) ~ {start_dt.strftime('%H:%M')} (시작)</span><br>
-                    <span>👤 담당자: {data['staff']}</span><br>
-                    <span style='{broadcast_style}'>📺 방　송: {data['simple_remark']}</span></div>"""
-
-                if "," in data['staff']: staff_display = data['staff'].replace(",", "<br>")
-                else: staff_display = data['staff']
-
-                schedule_data.append(dict(Task=data['location'], Start=setup_dt, Finish=start_dt, Resource="셋팅", Status="대기", ColorCode=setup_color, BarText="SET", Description=desc, Staff=staff_display))
-                schedule_data.append(dict(Task=data['location'], Start=start_dt, Finish=end_dt, Resource="본행사", Status="대기", ColorCode=main_color, BarText=staff_display, Description=desc, Staff=staff_display))
-                
-                js_events.append({ "location": data['location'], "setup_ts": setup_dt.timestamp() * 1000, "staff": data['staff'] })
-            except Exception: continue
-
-    return schedule_data, js_events
-
-def process_progressive_data(data):
-    now = datetime.datetime.now(KST)
-    processed = []
-    
-    for item in data:
-        start = item['Start']
-        finish = item['Finish']
-        
-        status = "대기"
-        if finish <= now: status = "종료"
-        elif start <= now < finish: 
-            status = "ON AIR" if item['Resource'] == "본행사" else "셋팅중"
-        elif item['Resource'] == "셋팅" and (start - datetime.timedelta(minutes=30)) <= now < start:
-            status = "셋팅임박"
-            
-        item['Status'] = status 
-
-        if finish <= now:
-            item_copy = item.copy()
-            item_copy['ColorCode'] = PAST_COLOR
-            processed.append(item_copy)
-        elif start >= now:
-            item_copy = item.copy()
-            item_copy['ColorCode'] = item['ColorCode']
-            processed.append(item_copy)
-        else:
-            part_past = item.copy()
-            part_past['Finish'] = now
-            part_past['ColorCode'] = PAST_COLOR
-            part_past['BarText'] = "" 
-            processed.append(part_past)
-            
-            part_future = item.copy()
-            part_future['Start'] = now
-            part_future['ColorCode'] = item['ColorCode'] 
-            processed.append(part_future)
-            
-    return processed
+def load_history_item(key):
+    # 본문은 "불러오기"를 누를 때만 읽어온다
+    text = load_history_text(key)
+    if text is not None: set_input_text(text)
 
 # ==========================================
-# 4. 메인 화면 구성
+# 3. 메인 화면 구성
 # ==========================================
 if 'input_text' not in st.session_state: st.session_state['input_text'] = ""
 
+# "🧪 cProfile" 버튼을 누른 바로 그 재실행 1회만 프로파일
+profiler = perf_metrics.start_profile() if st.session_state.pop('profile_rerun', False) else None
+
+BROADCAST_MODES = ["개인", "송출 (운영자)", "수신 (화면)"]
+# 로비 화면은 ?mode=viewer 로 열면 바로 수신 모드
+default_mode = 2 if st.query_params.get("mode") == "viewer" else 0
+broadcast = get_broadcast()
+SIDEBAR_CONFLICTS_MAX = 50
+HISTORY_FIELDS = ["전체", "담당자", "의원실", "장소", "제목"]
+USAGE_DEFAULT_DAYS = 90
+# 앱 안에서 가져오기할 때 파싱 프로세스 수 상한 (서버 프로세스와 CPU를 나눠 쓴다)
+IMPORT_WORKERS_MAX = 2
+# 감시할 원본 파일/폴더는 서버 설정으로만 정한다 (브라우저에서 서버 경로를 입력받지 않는다)
+WATCH_PATH = os.environ.get("SCHEDULE_WATCH_PATH", "").strip()
+# 원본 파일을 감시하는 동안은 자주 재실행해 바뀐 내용을 몇 초 안에 반영 (바뀌지 않은 재실행은 stat 몇 번 + 캐시 조회)
+WATCH_RELOAD_SECONDS = 5
+RELOAD_SECONDS = 30
+
+def browser_host():
+    # 운영자/화면 브라우저가 접속한 서버 이름 (Streamlit 밖의 클립/키오스크 서버 주소를 같은 이름으로 만든다)
+    return (st.context.headers.get('Host') or '').rsplit(':', 1)[0]
+
+def describe_conflict(conflict):
+    a, b = conflict.first, conflict.second
+    icon = "👤" if conflict.kind == "담당자" else "🏠"
+    return f"{icon} **{conflict.key}** {conflict.start.strftime('%H:%M')}~{conflict.end.strftime('%H:%M')} · {shorten_location(a.location)} {a.title} ↔ {shorten_location(b.location)} {b.title}"
+
 with st.sidebar:
     st.header("📝 스케줄 관리")
     tts_enabled = st.checkbox("🔊 TTS 소리 켜기 (체크 시 켜짐)", value=True)
+    live_mode = st.checkbox("🖥️ 브라우저 실시간 모드 (서버 새로고침 없음)", value=False)
+    broadcast_mode = st.radio("📡 방송 모드", BROADCAST_MODES, index=default_mode, horizontal=True)
+    is_viewer = broadcast_mode == BROADCAST_MODES[2]
+    if broadcast.published_at: st.caption(f"송출 중: v{broadcast.revision} ({broadcast.published_at.strftime('%H:%M:%S')})")
+    if broadcast_mode == BROADCAST_MODES[1]:
+        # 저사양 로비 화면은 Streamlit 대신 분당 1회 미리 그린 정적 HTML을 연다
+        kiosk_state = get_kiosk_state()
+        if st.checkbox("🪧 키오스크 스냅샷 (정적 HTML)", value=kiosk_state["enabled"], key="kiosk_enabled", on_change=toggle_kiosk):
+            from kiosk_snapshot import get_kiosk_service
+            kiosk = get_kiosk_service(broadcast).start()
+            # 체크는 스냅샷 갱신만 켜고 끈다. 포트는 서버 설정(SEMINAR_KIOSK_PORT)으로만 열고, 주소는 운영자 브라우저가 접속한 서버 이름으로
+            updated = f" (갱신 {kiosk.updated_at.strftime('%H:%M')})" if kiosk.updated_at else ""
+            if kiosk.error: st.warning(kiosk.error)
+            elif kiosk.url(): st.caption(f"로비 화면 주소: {kiosk.url(browser_host())}{updated}")
+            else: st.caption(f"static/kiosk 폴더에 기록 중{updated}. 로비 화면 주소는 서버에 SEMINAR_KIOSK_PORT를 설정하면 제공")
+    # 충돌 목록은 스케줄을 읽은 뒤에 채운다
+    conflict_slot = st.container()
+    perf_enabled = st.checkbox("⏱️ 성능 측정", value=perf_metrics.env_enabled())
+    perf_log_path = None
+    if perf_enabled:
+        if st.checkbox("JSONL 로그 기록", value=bool(perf_metrics.env_log_path())): perf_log_path = perf_metrics.env_log_path() or "perf_log.jsonl"
+        st.button("🧪 이번 실행 cProfile 저장", on_click=lambda: st.session_state.update(profile_rerun=True))
+    perf_metrics.begin_run(perf_enabled)
+    with st.expander("🧭 화면 구성"):
+        # 장소가 많은 날은 한 화면에 일부만 보여주고 페이지를 돌린다 (0 = 전체)
+        per_page = st.number_input("화면당 장소 수 (0 = 전체)", min_value=0, max_value=100, value=0, step=1)
+        rotate_seconds = st.number_input("페이지 전환 (초)", min_value=10, max_value=600, value=30, step=10)
+        pan_hours = st.slider("시간 이동 (시간)", min_value=-12.0, max_value=12.0, value=0.0, step=0.5)
+        margin_hours = st.slider("창 여유 (시간)", min_value=0.0, max_value=4.0, value=1.0, step=0.5)
+    if is_viewer:
+        # 운영자가 켜 둔 원본 감시는 수신 화면의 재실행에서도 확인한다 (운영자 탭이 닫혀 있어도 반영)
+        broadcast.refresh_source()
+        source_watcher = broadcast.source
+    else:
+        with st.expander("👀 원본 파일 감시"):
+            if not WATCH_PATH: st.caption("서버를 SCHEDULE_WATCH_PATH (파일 또는 .txt가 든 폴더)로 실행하면 켤 수 있습니다.")
+            else: st.caption(f"원본: {WATCH_PATH}")
+            if broadcast_mode == BROADCAST_MODES[1]:
+                # 송출 중이면 감시도 공유: 설정된 경로만 쓰므로 어느 운영자 탭이든 같은 감시를 켠다 (탭이 끌 수 없음)
+                source_watcher = broadcast.watch(WATCH_PATH)
+                broadcast.refresh_source()
+            else:
+                # 개인 모드는 세션마다 켜고 끈다 (경로는 같은 설정값)
+                watching = bool(WATCH_PATH) and st.checkbox("이 화면에서 감시", value=True)
+                source_watcher = st.session_state.get('source_watcher')
+                if not watching: source_watcher = None
+                elif source_watcher is None or source_watcher.path != WATCH_PATH: source_watcher = SourceWatcher(WATCH_PATH)
+                st.session_state['source_watcher'] = source_watcher
+                if source_watcher: source_watcher.poll()
+            if source_watcher:
+                # 입력창 위젯이 만들어지기 전에 새 원본을 넣는다 (세션마다 마지막으로 반영한 revision 기억)
+                if source_watcher.text is not None and st.session_state.get('watch_revision') != (source_watcher.path, source_watcher.revision):
+                    st.session_state['input_text'] = source_watcher.text
+                    st.session_state['watch_revision'] = (source_watcher.path, source_watcher.revision)
+                change = source_watcher.change
+                if source_watcher.error: st.warning(source_watcher.error)
+                elif change: st.caption(f"{change.at.strftime('%H:%M:%S')} 반영 · 섹션 +{change.added} −{change.removed}" + (f" · {', '.join(shorten_location(loc) for loc in change.locations)}" if change.locations else ""))
+                st.caption("감시 중에는 입력창을 직접 고쳐도 원본이 바뀌면 덮어씁니다.")
     st.divider()
 
     col1, col2 = st.columns([1, 1])
@@ -332,10 +261,31 @@ with st.sidebar:
 
     st.divider()
     st.subheader("📂 보관함")
-    history = load_history()
-    for key in sorted(history.keys(), reverse=True):
+    usage_enabled = st.checkbox("📊 보관함 사용 현황")
+    with st.expander("📦 일괄 가져오기"):
+        uploads = st.file_uploader("zip 또는 .txt 여러 개", type=["zip", "txt"], accept_multiple_files=True, label_visibility="collapsed")
+        if st.button("보관함에 넣기", disabled=not uploads):
+            # 파싱 워커 풀은 이때만, 서버 스레드와 섞이지 않게 별도 프로세스에서 띄운다
+            import tempfile
+            from history_import import import_in_subprocess
+            progress = st.empty()
+            with tempfile.TemporaryDirectory() as folder:
+                # 업로드 순서와 원래 파일 이름(제목)을 그대로 넘긴다
+                paths = [os.path.join(folder, f"{i:04d}", os.path.basename(upload.name)) for i, upload in enumerate(uploads)]
+                for path, upload in zip(paths, uploads):
+                    os.makedirs(os.path.dirname(path))
+                    with open(path, "wb") as f: f.write(upload.getvalue())
+                result = import_in_subprocess(paths, workers=min(os.cpu_count() or 1, IMPORT_WORKERS_MAX), on_progress=lambda r: progress.caption(f"저장 {r['saved']}건..."))
+            progress.success(f"파일 {result['files']}개 중 {result['saved']}건 저장")
+            for name, reason in result["skipped"]: st.caption(f"건너뜀: {name} ({reason})")
+    search_col, field_col = st.columns([2, 1])
+    with search_col: history_query = st.text_input("🔎 검색", placeholder="담당자, 의원실, 장소, 제목", label_visibility="collapsed")
+    with field_col: history_field = st.selectbox("분야", HISTORY_FIELDS, label_visibility="collapsed")
+    history_titles = search_history(history_query, None if history_field == HISTORY_FIELDS[0] else history_field) if history_query.strip() else load_history_titles()
+    if history_query.strip(): st.caption(f"검색 결과 {len(history_titles)}건")
+    for key in history_titles:
         with st.expander(key):
-            st.button("불러오기", key=f"load_{key}", on_click=set_input_text, args=(history[key],))
+            st.button("불러오기", key=f"load_{key}", on_click=load_history_item, args=(key,))
             # [수정] SyntaxError 해결 (콜론 추가)
             if st.button("삭제", key=f"del_{key}", on_click=delete_history, args=(key,)):
                 st.rerun()
@@ -362,115 +312,90 @@ st.markdown(
 if st.button("Refresh Trigger", key="auto_refresh_btn"):
     pass 
 
-raw_schedule_data, js_events = extract_schedule(st.session_state['input_text'])
-
-if raw_schedule_data:
-    processed_data = process_progressive_data(raw_schedule_data)
-    df = pd.DataFrame(processed_data)
-    
-    task_map = {item['Task']: shorten_location(item['Task']) for item in raw_schedule_data}
-    df['ShortTask'] = df['Task'].map(task_map)
-
-    dynamic_height = max(800, len(task_map) * 80 + 250) 
-
-    fig = px.timeline(
-        df, x_start="Start", x_end="Finish", y="ShortTask", 
-        text="BarText", custom_data=["Description"], 
-        opacity=1.0 
-    )
-    
-    fig.update_traces(
-        marker_color=df['ColorCode'], 
-        textposition='inside', insidetextanchor='middle', 
-        hovertemplate="%{customdata[0]}<extra></extra>", 
-        hoverlabel=dict(font_size=20, font_family="Do Hyeon", align="left", bgcolor="white", font_color="black"),
-        textfont=dict(size=30, family="Do Hyeon", color="black"), 
-        marker=dict(line=dict(width=0)) 
-    )
-    
+if is_viewer:
+    # 수신 화면은 직접 파싱하지 않고 운영자가 발행한 색인/그림을 그대로 쓴다
+    schedule = broadcast.current() or load_schedule("")
+else:
+    with perf_metrics.stage("extract_schedule"): schedule = load_schedule(st.session_state['input_text'])
+    if broadcast_mode == BROADCAST_MODES[1] and schedule: broadcast.publish(st.session_state['input_text'])
+js_events = list(schedule.js_events)
+
+with perf_metrics.stage("conflicts"): conflict_report = schedule.conflicts if schedule else None
+if conflict_report and conflict_report.total:
+    with conflict_slot.expander(f"⚠️ 일정 충돌 {conflict_report.total}건 (빨간 테두리)", expanded=True):
+        shown = conflict_report.conflicts[:SIDEBAR_CONFLICTS_MAX]
+        for conflict in shown: st.markdown(describe_conflict(conflict))
+        if conflict_report.total > len(shown): st.caption(f"외 {conflict_report.total - len(shown)}건")
+
+pages = 1
+if schedule:
+    # pandas/plotly는 그릴 스케줄이 생겼을 때 처음 import (빈 화면/수신 대기 화면은 가볍게 뜬다)
+    from schedule_figure import CLIENT_TICK_SECONDS, build_figure, build_figure_html, build_live_timeline_html, get_base_layout, visible_window
+    # 색인은 스케줄 버전당, 뼈대는 장소 구성당 1회. 매 틱은 now 기준 분할과 now 선/상태 배지만 덧붙임
     now_dt_kst = datetime.datetime.now(KST)
-    half_window = datetime.timedelta(hours=4)
-    range_x_start = now_dt_kst - half_window
-    range_x_end = now_dt_kst + half_window
-
-    fig.update_xaxes(
-        showgrid=True, gridwidth=1, gridcolor='#444', 
-        showline=False, ticks="", showticklabels=False, title="", 
-        tickformat="%H:%M", dtick=3600000, 
-        tickmode='linear', tickangle=0, side="top", 
-        range=[range_x_start, range_x_end], automargin=True
-    )
-    
-    fig.update_yaxes(
-        showgrid=False, showline=False, showticklabels=False, 
-        title="", autorange="reversed", automargin=True
-    )
-    
-    start_hour = 5; end_hour = 21
-    today_str = now_dt_kst.strftime("%Y-%m-%d")
-    
-    for hour in range(start_hour, end_hour + 1):
-        time_str = f"{hour:02d}:00"
-        x0_time = pd.Timestamp(f"{today_str} {hour:02d}:00")
-        x1_time = pd.Timestamp(f"{today_str} {hour:02d}:59") if hour == end_hour else pd.Timestamp(f"{today_str} {hour+1:02d}:00")
-
-        fig.add_shape(type="rect", xref="x", yref="paper", x0=x0_time, x1=x1_time, y0=1.01, y1=1.10, line=dict(color="white", width=1), fillcolor="#1E1E1E")
-        fig.add_annotation(x=x0_time + (x1_time - x0_time) / 2, y=1.055, xref="x", yref="paper", text=time_str, showarrow=False, yanchor="middle", font=dict(size=26, color="white", family="Do Hyeon"))
-
-    unique_tasks_ordered = []
-    seen = set()
-    for item in raw_schedule_data:
-        t = item['Task']
-        if t not in seen: unique_tasks_ordered.append(t); seen.add(t)
-
-    for i, full_task_name in enumerate(unique_tasks_ordered):
-        short_task = shorten_location(full_task_name)
-        loc_main_color = get_color_for_location(full_task_name, is_setup=False)
-        
-        fig.add_shape(type="rect", xref="x", yref="y", x0=pd.Timestamp(f"{today_str} 05:00"), x1=pd.Timestamp(f"{today_str} 21:00"), y0=i-0.1, y1=i+0.1, fillcolor="#333333", line=dict(width=0), layer="below")
-        fig.add_shape(type="rect", xref="paper", yref="y", x0=-0.07, x1=-0.06, y0=i-0.4, y1=i+0.4, fillcolor=loc_main_color, line=dict(width=0))
-        fig.add_annotation(x=-0.02, xref="paper", y=i, yref="y", text=f"<b>{short_task}</b>", showarrow=False, font=dict(size=45, color="white", family="Do Hyeon"), align="right")
-        
-        items = [x for x in processed_data if x['Task'] == full_task_name]
-        status_text = "⚪ 대기"; status_color = "gray"
-        
-        raw_items = [x for x in raw_schedule_data if x['Task'] == full_task_name]
-        has_on_air = False; has_setting = False; has_imminent = False; all_finished = True
-        
-        for item in raw_items:
-            start = item['Start']; finish = item['Finish']
-            if finish > now_dt_kst: all_finished = False
-            if start <= now_dt_kst < finish:
-                if item['Resource'] == "본행사": has_on_air = True
-                elif item['Resource'] == "셋팅": has_setting = True
-            if item['Resource'] == "셋팅" and (start - datetime.timedelta(minutes=30)) <= now_dt_kst < start: has_imminent = True
-
-        if has_on_air: status_text, status_color = "🔴 ON AIR", "#FF5252"
-        elif has_setting: status_text, status_color = "🟡 셋팅중", "#FFD740"
-        elif has_imminent: status_text, status_color = "🟠 셋팅임박", "#FFAB40"
-        elif all_finished: status_text, status_color = "⚫ 종료", "#9E9E9E"
-            
-        fig.add_annotation(x=0.98, xref="paper", y=i, yref="y", text=status_text, showarrow=False, font=dict(size=24, color=status_color, family="Do Hyeon"), align="right", bgcolor="#1E1E1E", bordercolor=status_color, borderwidth=2, borderpad=4)
-
-    fig.add_vline(x=now_dt_kst, line_width=2, line_dash="solid", line_color="red")
-    fig.add_annotation(x=now_dt_kst, y=1.10, xref="x", yref="paper", text="▼", showarrow=False, font=dict(size=25, color="red"), yshift=0)
-
-    fig.update_layout(height=dynamic_height, font=dict(size=14, family="Do Hyeon"), showlegend=False, paper_bgcolor='#1E1E1E', plot_bgcolor='#1E1E1E', margin=dict(t=120, b=100, l=180, r=10), hoverlabel_align='left')
-    
-    st.plotly_chart(fig, use_container_width=True, config={'responsive': True})
+    page_locs, page, pages = page_locations(schedule.locations, per_page, now_dt_kst, rotate_seconds)
+    if pages > 1: st.caption(f"장소 {page + 1} / {pages} 페이지 ({rotate_seconds}초마다 전환)")
+    pan = datetime.timedelta(hours=pan_hours)
+    margin = datetime.timedelta(hours=margin_hours)
+    if live_mode:
+        # 브라우저가 now 선/과거 색상/상태 배지를 직접 갱신 -> 스케줄(또는 페이지)이 바뀔 때만 서버 재실행
+        # 시간 창은 브라우저가 매 틱 직접 거르므로 페이지 장소만 자른다
+        build_live = lambda: build_live_timeline_html(schedule.view(page_locs), now_dt_kst)
+        live_html = broadcast.artifact("live_html", (now_dt_kst.date(), per_page, page), build_live) if is_viewer else build_live()
+        perf_metrics.record("live_html_bytes", len(live_html.encode("utf-8")))
+        with perf_metrics.stage("components.html"): components.html(live_html, height=get_base_layout(schedule.view(page_locs), now_dt_kst)['height'])
+    else:
+        # 보이는 창(±4h)과 여유만큼의 막대만 만들고 보낸다
+        def build_view_figure(at):
+            center = at + pan
+            with perf_metrics.stage("schedule view"):
+                view = schedule.view(page_locs, visible_window(at, center, margin))
+                view.positions  # 창 안 막대 이분 탐색 (열 모델은 이 위치만 잘라 쓴다)
+            return build_figure(view, at, center)
+        if is_viewer:
+            # 같은 30초 구간(그리고 같은 페이지/이동)의 화면들은 한 번 만들고 직렬화한 그림 HTML을 공유
+            tick = int(now_dt_kst.timestamp()) // CLIENT_TICK_SECONDS * CLIENT_TICK_SECONDS
+            tick_now = datetime.datetime.fromtimestamp(tick, KST)
+            figure_html, height = broadcast.artifact("figure_html", (tick, per_page, page, pan_hours, margin_hours), lambda: build_figure_html(build_view_figure(tick_now)))
+            perf_metrics.record("figure_json_bytes", len(figure_html.encode("utf-8")))
+            with perf_metrics.stage("components.html"): components.html(figure_html, height=height)
+        else:
+            fig = build_view_figure(now_dt_kst)
+            # 직렬화 크기 측정은 그 자체로 비용이 있어 측정 중일 때만
+            if perf_metrics.is_active(): perf_metrics.record("figure_json_bytes", len(fig.to_json().encode("utf-8")))
+            with perf_metrics.stage("st.plotly_chart"): st.plotly_chart(fig, use_container_width=True, config={'responsive': True})
+elif is_viewer:
+    st.info("📡 운영자 화면에서 '송출' 모드로 스케줄을 불러오면 이 화면에 표시됩니다.")
 else:
     st.info("👈 왼쪽 사이드바에 스케줄을 입력하고 '🥕 스케줄 불러오기'를 누르세요.")
 
-js_events_json = json.dumps(js_events)
+# 다가오는 안내 문장은 백그라운드에서 미리 합성 (발화 시점에 합성을 기다리지 않음)
+tts_clips = get_tts_service().pregenerate(js_events, time.time() * 1000, browser_host()) if tts_enabled else {}
+
+js_announcements_json = json.dumps(announcement_schedule(js_events), ensure_ascii=False).replace("</", "<\\/")
+js_tts_clips_json = json.dumps(tts_clips, ensure_ascii=False).replace("</", "<\\/")
 js_tts_enabled = str(tts_enabled).lower()
+# 수신 화면은 새 버전을 받아오기 위해 계속 새로고침 (공유 산출물 덕분에 재실행 비용은 작음)
+# 실시간 모드라도 장소 페이지를 돌릴 때는 새로고침이 필요
+js_auto_reload = str(not live_mode or is_viewer or pages > 1 or source_watcher is not None).lower()
+js_reload_ms = (WATCH_RELOAD_SECONDS if source_watcher is not None else RELOAD_SECONDS) * 1000
+# 장소 페이지는 서버가 epoch 기준 rotate_seconds 구간으로 고르므로, 새로고침도 그 경계에 맞춘다
+js_rotate_ms = rotate_seconds * 1000 if pages > 1 else 0
 
 components.html(
     f"""
     <script>
-        const events = {js_events_json};
-        const announced = new Set(); 
+        const announcements = {js_announcements_json};
+        const graceMs = {ANNOUNCE_GRACE_MS};
         const ttsEnabled = {js_tts_enabled};
+        const autoReload = {js_auto_reload};
+        const reloadMs = {js_reload_ms};
+        const rotateMs = {js_rotate_ms};
+        const ttsClips = {js_tts_clips_json};
         let timeSinceLastReload = 0; 
+        // 다음 페이지 경계 + 1초 (서버 시계가 조금 늦어도 새 페이지를 고르도록)
+        const nextRotateAt = () => rotateMs ? (Math.floor(Date.now() / rotateMs) + 1) * rotateMs + 1000 : Infinity;
+        let rotateAt = nextRotateAt();
 
         function updateSystem() {{
             const now = new Date();
@@ -482,50 +407,134 @@ components.html(
                 clockTarget.innerText = dateString + " " + timeString;
             }}
 
-            events.forEach(event => {{
-                const setupTime = new Date(event.setup_ts);
-                const diffMs = setupTime - now;
-                const diffMins = diffMs / 1000 / 60; 
-
-                if (diffMins >= 4.9 && diffMins <= 5.1) {{
-                    const key = event.location + "_5min";
-                    if (!announced.has(key)) {{ 
-                        speak(event.location + ", 셋팅 시작 5분 전입니다. " + event.staff + " 준비해 주세요."); 
-                        announced.add(key); 
-                    }}
-                }}
-                if (diffMins >= -0.1 && diffMins <= 0.1) {{
-                    const key = event.location + "_exact";
-                    if (!announced.has(key)) {{ 
-                        speak(event.location + ", 셋팅 시작 시간입니다. " + event.staff + " 준비해 주세요."); 
-                        announced.add(key); 
-                    }}
-                }}
-            }});
-
             timeSinceLastReload += 1000;
-            if (timeSinceLastReload >= 30000) {{
+            const rotateDue = Date.now() >= rotateAt;
+            if ((autoReload && timeSinceLastReload >= reloadMs) || rotateDue) {{
                 const buttons = window.parent.document.querySelectorAll('button');
                 for (const btn of buttons) {{
                     if (btn.innerText.includes("Refresh Trigger")) {{
                         btn.click();
                         timeSinceLastReload = 0; 
+                        rotateAt = nextRotateAt();
                         break;
                     }}
                 }}
             }}
         }}
 
-        function speak(text) {{
-            if (ttsEnabled && 'speechSynthesis' in window) {{
+        function speakWithBrowser(text) {{
+            if ('speechSynthesis' in window) {{
                 const utterance = new SpeechSynthesisUtterance(text);
                 utterance.lang = 'ko-KR'; utterance.rate = 1.0;     
                 window.speechSynthesis.speak(utterance);
             }}
         }}
 
+        function speak(text) {{
+            if (!ttsEnabled) return;
+            // 서버에서 미리 합성해 둔 클립이 있으면 재생, 아직 없거나 재생이 막히면 브라우저 음성으로 대체
+            const clip = ttsClips[text];
+            if (!clip) {{ speakWithBrowser(text); return; }}
+            const audio = new Audio(new URL(clip, window.parent.location.href).href);
+            audio.onerror = () => speakWithBrowser(text);
+            audio.play().catch(() => speakWithBrowser(text));
+        }}
+
+        // 발화 시각 순 최소 힙: 다음 안내까지 잠들었다가 깨어나고, 놓친 안내는 graceMs 안이면 늦게라도 안내
+        class MinHeap {{
+            constructor() {{ this.items = []; }}
+            size() {{ return this.items.length; }}
+            peek() {{ return this.items[0]; }}
+            push(item) {{
+                const a = this.items; a.push(item);
+                let i = a.length - 1;
+                while (i > 0) {{
+                    const p = (i - 1) >> 1;
+                    if (a[p].at <= a[i].at) break;
+                    [a[p], a[i]] = [a[i], a[p]]; i = p;
+                }}
+            }}
+            pop() {{
+                const a = this.items; const top = a[0]; const last = a.pop();
+                if (a.length) {{
+                    a[0] = last;
+                    let i = 0;
+                    while (true) {{
+                        const l = 2 * i + 1, r = l + 1; let m = i;
+                        if (l < a.length && a[l].at < a[m].at) m = l;
+                        if (r < a.length && a[r].at < a[m].at) m = r;
+                        if (m === i) break;
+                        [a[m], a[i]] = [a[i], a[m]]; i = m;
+                    }}
+                }}
+                return top;
+            }}
+        }}
+
+        // 안내 완료 키는 부모 페이지 sessionStorage에 보관 (iframe이 다시 로드돼도 중복 안내 안 함)
+        const STORAGE_KEY = 'seminarAnnounced';
+        const storage = (() => {{ try {{ return window.parent.sessionStorage; }} catch (e) {{ return null; }} }})();
+        const validKeys = new Set(announcements.map(a => a.key));
+        const announced = new Set(JSON.parse((storage && storage.getItem(STORAGE_KEY)) || '[]').filter(key => validKeys.has(key)));
+        function markAnnounced(key) {{
+            announced.add(key);
+            if (storage) storage.setItem(STORAGE_KEY, JSON.stringify([...announced]));
+        }}
+
+        const heap = new MinHeap();
+        announcements.forEach(a => {{ if (!announced.has(a.key)) heap.push(a); }});
+        let announceTimer = null;
+
+        function runDueAnnouncements() {{
+            const nowMs = Date.now();
+            while (heap.size() && heap.peek().at <= nowMs) {{
+                const a = heap.pop();
+                if (announced.has(a.key)) continue;
+                if (nowMs - a.at <= graceMs) speak(a.text);
+                markAnnounced(a.key);
+            }}
+            scheduleNextAnnouncement();
+        }}
+
+        function scheduleNextAnnouncement() {{
+            clearTimeout(announceTimer);
+            if (!heap.size()) return;
+            // 시계 보정/절전 대비로 최대 1분마다 다시 확인
+            const wait = Math.min(Math.max(heap.peek().at - Date.now(), 0), 60000);
+            announceTimer = setTimeout(runDueAnnouncements, wait);
+        }}
+
+        document.addEventListener('visibilitychange', runDueAnnouncements);
+        runDueAnnouncements();
         setInterval(updateSystem, 1000);
     </script>
     """,
     height=0
 )
+
+if usage_enabled:
+    from schedule_figure import build_lead_histogram, build_usage_heatmap, build_usage_totals
+    with st.expander("📊 보관함 사용 현황", expanded=True):
+        period_col, kind_col, key_col = st.columns([2, 1, 2])
+        today = now_init.date()
+        with period_col: period = st.date_input("기간", value=(today - datetime.timedelta(days=USAGE_DEFAULT_DAYS), today))
+        with kind_col: usage_kind = st.radio("기준", USAGE_KINDS, horizontal=True)
+        with key_col: usage_key = st.selectbox("대상", ["전체"] + usage_keys(usage_kind))
+        # 달력에서 시작일만 고른 중간 상태는 하루로 본다
+        start, end = (period[0], period[-1]) if isinstance(period, (list, tuple)) and period else (period, period)
+        summary = usage_summary(start, end, usage_kind, None if usage_key == "전체" else [usage_key])
+        if not summary["days"]: st.info("이 기간에 보관된 스케줄이 없습니다.")
+        else:
+            categories = " · ".join(f"{category or usage_kind} {hours:.1f}시간" for category, hours in summary["categories"].items())
+            st.caption(f"스케줄이 있는 날 {summary['days']}일 · {categories}")
+            st.plotly_chart(build_usage_heatmap(summary, f"요일 x 시간대 평균 사용 ({usage_key})"), use_container_width=True)
+            totals_col, lead_col = st.columns(2)
+            with totals_col: st.plotly_chart(build_usage_totals(summary, usage_kind), use_container_width=True)
+            with lead_col: st.plotly_chart(build_lead_histogram(summary), use_container_width=True)
+
+perf_metrics.end_run(perf_log_path)
+if perf_enabled:
+    with st.expander("⏱️ 성능 측정 (최근 재실행, ms / bytes)"):
+        st.table(perf_metrics.summary())
+if profiler is not None:
+    st.caption(f"🧪 cProfile 저장: {perf_metrics.stop_profile(profiler)}")
@@ -0,0 +1,275 @@
+"""스케줄 처리 단계별 벤치마크 (Streamlit 없이 실행).
+
+    python benchmark.py                      # 10 ~ 10,000 이벤트 측정
+    python benchmark.py --sizes 100 1000     # 원하는 크기만
+    python benchmark.py --update-baseline    # 현재 결과를 기준값으로 저장
+    python benchmark.py --check              # 기준값보다 느려진 단계가 있으면 종료 코드 1
+
+기준값은 검사할 컴퓨터에서 --update-baseline으로 만든다. 시간은 컴퓨터마다 다르므로 기준값에 측정한 컴퓨터 정보와
+보정 루프(순수 파이썬 고정 작업) 시간을 함께 저장하고, --check는 두 보정 시간의 비율로 기준값을 늘이거나 줄여 비교한다.
+다른 컴퓨터에서 만든 기준값이면 경고를 내며, 보정은 대략적인 것이라 그대로 믿지 말고 이 컴퓨터에서 다시 만드는 것이 좋다.
+느려진 것으로 보인 단계는 몇 번 더 측정해 최솟값으로 다시 판단한다 (한 번 튄 측정으로 실패하지 않도록).
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from schedule_core import KST, ScheduleIndex, clear_parse_cache, extract_schedule, find_conflicts, load_schedule
+
+# ==========================================
+# 1. 가상 스케줄 생성기
+# ==========================================
+ROOM_KINDS = ["소회의실", "세미나실", "간담회실", "대회의실"]
+STAFF_NAMES = ["홍길동", "김철수", "이영희", "박민수", "최지우", "정다은", "강하늘", "윤서준", "임수빈", "한지민"]
+OFFICES = ["김의원실", "이의원실", "박의원실", "최의원실", "정의원실"]
+REMARKS = ["생중계", "녹화", "유튜브 송출 없음", None]
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+# --check에서 느려진 것으로 보인 단계를 다시 측정하는 횟수
+CHECK_RETRIES = 2
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+def generate_schedule_text(n_events, n_locations=12, staff_per_event=(1, 3), remark_ratio=0.6, date=None, seed=0):
+    """붙여넣기 형식(===== 구분)의 가상 스케줄. 장소는 소/세/간 방과 기타 방을 섞는다."""
+    rng = random.Random(seed)
+    date = date or datetime.datetime.now(KST).date()
+    weekday = "월화수목금토일"[date.weekday()]
+    locations = [f"제{i + 1}{ROOM_KINDS[i % len(ROOM_KINDS)]}" for i in range(n_locations)]
+
+    sections = []
+    for _ in range(n_events):
+        start_minutes = rng.randrange(7 * 60, 19 * 60, 10)
+        setup_minutes = start_minutes - rng.choice([20, 30, 40, 60])
+        staff = ", ".join(rng.sample(STAFF_NAMES, rng.randint(*staff_per_event)))
+        lines = [
+            f"{date.month}.{date.day}({weekday}) {start_minutes // 60}시{start_minutes % 60}분/{setup_minutes // 60}시{setup_minutes % 60}분",
+            f"{rng.choice(locations)} - {staff}",
+            f"{rng.choice(OFFICES)} / {rng.choice(STAFF_NAMES)}",
+            f"정책 토론회 {rng.randint(1, 999)}",
+        ]
+        if rng.random() < remark_ratio:
+            remark = rng.choice(REMARKS)
+            if remark: lines.append(remark)
+        sections.append("\n".join(lines))
+    return "\n=====\n".join(sections)
+
+# ==========================================
+# 2. 단계 정의
+# ==========================================
+def _figure_module():
+    # numpy/plotly/pandas가 없는 환경에서도 파싱/상태 단계는 측정할 수 있도록 지연 import
+    try:
+        import schedule_columns
+        import schedule_figure
+        return schedule_columns, schedule_figure
+    except ImportError:
+        return None, None
+
+def build_stages(text, now):
+    """(이름, 준비 함수, 측정 함수) 목록. 준비 함수 결과가 측정 함수 인자로 들어간다."""
+    schedule_columns, schedule_figure = _figure_module()
+    schedule = load_schedule(text)
+    edited = text.replace("정책 토론회", "정책 간담회", 1)
+
+    def cold_parse():
+        clear_parse_cache()
+        return text
+
+    def edited_parse():
+        clear_parse_cache(); extract_schedule(text)
+        return edited
+
+    def unchanged_parse():
+        extract_schedule(text)
+        return text
+
+    stages = [
+        ("extract_schedule", cold_parse, extract_schedule),
+        ("extract_schedule_incremental", edited_parse, extract_schedule),
+        ("extract_schedule_unchanged", unchanged_parse, extract_schedule),
+        ("build_index", lambda: schedule.rows, ScheduleIndex),
+        ("location_statuses", lambda: now, schedule.location_statuses),
+        ("find_conflicts", lambda: list(schedule.events.values()), find_conflicts),
+        ("schedule_view", lambda: (now - datetime.timedelta(hours=5), now + datetime.timedelta(hours=5)), lambda window: schedule.view(schedule.locations[:10], window).positions),
+    ]
+    if schedule_figure is not None:
+        def cold_layout():
+            schedule_figure._base_layout_cache.clear()
+            return now
+        def cold_columns():
+            schedule_columns._columns_cache.clear()
+            return schedule
+        columns = schedule_columns.get_event_columns(schedule)
+        split = columns.split_at(now)
+        stages += [
+            ("event_columns", cold_columns, schedule_columns.get_event_columns),
+            # 앱이 매 틱 실제로 쓰는 지난 구간/걸친 막대 분할 (열 모델)
+            ("process_progressive_data", lambda: now, columns.split_at),
+            ("columns_location_statuses", lambda: now, columns.location_statuses),
+            ("figure_base_layout", cold_layout, lambda n: schedule_figure.get_base_layout(schedule, n)),
+            ("figure_bars", lambda: split, lambda p: schedule_figure.build_bar_traces(columns, p)),
+            ("figure_tick", lambda: now, lambda n: schedule_figure.build_figure(schedule, n)),
+            ("figure_tick_view", lambda: now, lambda n: schedule_figure.build_figure(schedule.view(schedule.locations[:10], schedule_figure.visible_window(n)), n)),
+            ("figure_to_json", lambda: schedule_figure.build_figure(schedule, now), lambda fig: fig.to_json()),
+        ]
+    return stages
+
+# ==========================================
+# 3. 측정
+# ==========================================
+def measure(prepare, run, repeat):
+    # 첫 호출의 지연 import/검증기 로딩이 섞이지 않도록 1회 예열
+    run(prepare())
+    times = []
+    for _ in range(repeat):
+        arg = prepare()
+        gc.collect()
+        start = time.perf_counter()
+        run(arg)
+        times.append(time.perf_counter() - start)
+
+    # 메모리 측정은 tracemalloc 오버헤드가 시간에 섞이지 않도록 따로 1회
+    arg = prepare()
+    gc.collect()
+    tracemalloc.start()
+    run(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"median_ms": statistics.median(times) * 1000, "min_ms": min(times) * 1000, "peak_kb": peak / 1024}
+
+def run_benchmark(sizes, repeat=5, seed=0, only=None, **generator_options):
+    """only가 있으면 그 (크기, 단계) 쌍만 측정 (--check 재측정용)."""
+    results = {}
+    now = datetime.datetime.combine(datetime.datetime.now(KST).date(), datetime.time(12, 0), tzinfo=KST)
+    for size in sizes:
+        text = generate_schedule_text(size, seed=seed, **generator_options)
+        results[str(size)] = {}
+        for name, prepare, run in build_stages(text, now):
+            if only is not None and (str(size), name) not in only: continue
+            # 큰 입력은 반복 횟수를 줄인다
+            results[str(size)][name] = measure(prepare, run, repeat if size < 10000 else max(1, repeat // 2))
+    return results
+
+# ==========================================
+# 4. 기준값 비교 (컴퓨터 정보 + 보정 루프)
+# ==========================================
+def machine_info():
+    return {"node": platform.node(), "machine": platform.machine(), "processor": platform.processor(),
+            "system": platform.system(), "python": platform.python_version(), "implementation": platform.python_implementation()}
+
+def _calibration_work():
+    # 파싱/색인과 비슷한 순수 파이썬 작업 (정렬, dict, 문자열)
+    words = [f"제{i % 97}소회의실 {i}" for i in range(20000)]
+    index = {}
+    for i, word in enumerate(sorted(words)): index.setdefault(word.split()[0], []).append(i)
+    return "".join(words[:2000]).split("실")
+
+def calibrate(repeat=15):
+    """이 컴퓨터에서 고정 작업에 걸리는 시간 (최솟값, ms). 기준값과 현재 결과의 컴퓨터 속도 차이를 맞추는 데 쓴다."""
+    _calibration_work()
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        _calibration_work()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+def baseline_document(results, calibration_ms):
+    return {"machine": machine_info(), "calibration_ms": calibration_ms, "results": results}
+
+def load_baseline(path):
+    """(결과, 보정 시간 또는 None, 컴퓨터 정보 또는 None). 컴퓨터 정보가 없는 예전 형식(결과만)도 읽는다."""
+    with open(path, "r", encoding="utf-8") as f: document = json.load(f)
+    if "results" not in document: return document, None, None
+    return document["results"], document.get("calibration_ms"), document.get("machine")
+
+def check_regressions(results, baseline, tolerance, scale=1.0):
+    """기준값 대비 (1 + tolerance)배 넘게 느려진 (크기, 단계, 현재 최솟값, 보정한 기준 최솟값) 목록.
+    scale은 (지금 보정 시간 / 기준값 보정 시간): 이 컴퓨터가 두 배 느리면 기준값도 두 배로 보고 비교한다."""
+    regressions = []
+    for size, stages in results.items():
+        for name, stat in stages.items():
+            base = baseline.get(size, {}).get(name)
+            if base is None: continue
+            # 공유 머신의 잡음에 덜 흔들리도록 최솟값으로 비교하고, 1ms 미만 단계는 절대 여유 0.5ms를 더 준다
+            expected = base["min_ms"] * scale
+            if stat["min_ms"] > expected * (1 + tolerance) + 0.5: regressions.append((size, name, stat["min_ms"], expected))
+    return regressions
+
+def recheck_regressions(regressions, results, baseline, tolerance, scale, retries=CHECK_RETRIES, **benchmark_options):
+    """느려진 것으로 보인 단계만 retries번 더 측정해 최솟값을 갱신하고 다시 판단한다 (results를 고친다)."""
+    for _ in range(retries):
+        if not regressions: break
+        only = {(size, name) for size, name, _, _ in regressions}
+        rerun = run_benchmark(sorted({int(size) for size, _ in only}), only=only, **benchmark_options)
+        for size, stages in rerun.items():
+            for name, stat in stages.items():
+                current = results[size][name]
+                current["min_ms"] = min(current["min_ms"], stat["min_ms"])
+        rechecked = {}
+        for size, name in only: rechecked.setdefault(size, {})[name] = results[size][name]
+        regressions = check_regressions(rechecked, baseline, tolerance, scale)
+    return regressions
+
+def print_results(results):
+    print(f"{'size':>6}  {'stage':<30} {'median ms':>10} {'min ms':>10} {'peak KiB':>10}")
+    for size, stages in results.items():
+        for name, stat in stages.items():
+            print(f"{size:>6}  {name:<30} {stat['median_ms']:>10.2f} {stat['min_ms']:>10.2f} {stat['peak_kb']:>10.1f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seminar Schedule 단계별 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="이벤트(섹션) 수")
+    parser.add_argument("--locations", type=int, default=12, help="장소 수")
+    parser.add_argument("--staff", type=int, nargs=2, default=(1, 3), metavar=("MIN", "MAX"), help="이벤트당 담당자 수 범위")
+    parser.add_argument("--remark-ratio", type=float, default=0.6, help="방송 비고 줄이 붙는 비율")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true", help="결과를 기준값 파일로 저장")
+    parser.add_argument("--check", action="store_true", help="기준값 대비 느려지면 종료 코드 1")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="허용 비율 (0.5 = 50%% 느려질 때까지 허용)")
+    parser.add_argument("--json", dest="json_out", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args(argv)
+
+    options = dict(repeat=args.repeat, seed=args.seed, n_locations=args.locations, staff_per_event=tuple(args.staff), remark_ratio=args.remark_ratio)
+    # 보정 루프는 측정 앞뒤로 재서 작은 쪽 (터보/다른 작업의 영향을 덜 받도록)
+    calibration_ms = calibrate()
+    results = run_benchmark(args.sizes, **options)
+    calibration_ms = min(calibration_ms, calibrate())
+    print_results(results)
+    print(f"보정 루프: {calibration_ms:.2f}ms")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f: json.dump(baseline_document(results, calibration_ms), f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f: json.dump(baseline_document(results, calibration_ms), f, indent=2)
+        print(f"기준값 저장: {args.baseline}")
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"기준값 파일 없음: {args.baseline} (이 컴퓨터에서 --update-baseline으로 만들 것)", file=sys.stderr); return 2
+        baseline, base_calibration_ms, base_machine = load_baseline(args.baseline)
+        if base_machine != machine_info():
+            print(f"경고: 다른 컴퓨터(또는 파이썬)에서 만든 기준값 ({(base_machine or {}).get('node', '정보 없음')}). "
+                  "보정 루프 비율로 맞춰 비교하지만, 정확히 보려면 이 컴퓨터에서 --update-baseline으로 다시 만들 것", file=sys.stderr)
+        scale = calibration_ms / base_calibration_ms if base_calibration_ms else 1.0
+        if scale != 1.0: print(f"기준값 보정 배율: {scale:.2f}")
+        regressions = check_regressions(results, baseline, args.tolerance, scale)
+        regressions = recheck_regressions(regressions, results, baseline, args.tolerance, scale, **options)
+        for size, name, current, base in regressions:
+            print(f"느려짐: size={size} {name} {current:.2f}ms (기준 {base:.2f}ms)", file=sys.stderr)
+        if regressions: return 1
+        print("기준값 대비 느려진 단계 없음")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""스케줄 텍스트 파일을 보관함에 한꺼번에 넣기 (폴더 또는 zip).
+
+    python history_import.py exports/                 # 폴더 안의 .txt 전부 (하위 폴더 포함)
+    python history_import.py 2025.zip 2026.zip        # zip 안의 .txt 전부
+    python history_import.py exports/ --workers 4 --batch-size 500
+"""
+import argparse
+import collections
+import concurrent.futures
+import datetime
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import zipfile
+
+from schedule_core import HISTORY_DB, KST, decode_text, history_digest, history_title, save_history_entries
+
+# ==========================================
+# 1. 입력 (파일 하나씩 지연 읽기)
+# ==========================================
+IMPORT_EXTENSIONS = (".txt",)
+BATCH_SIZE = 200
+# 워커당 동시에 들고 있는 파일 수. 전체 묶음을 메모리에 올리지 않도록 이만큼만 미리 읽는다
+INFLIGHT_PER_WORKER = 4
+
+def _wanted(name):
+    return name.lower().endswith(IMPORT_EXTENSIONS) and not os.path.basename(name).startswith(".")
+
+def iter_zip(source):
+    """zip 경로 또는 파일 객체(업로드)에서 (이름, 바이트)를 하나씩."""
+    with zipfile.ZipFile(source) as archive:
+        for info in sorted(archive.infolist(), key=lambda info: info.filename):
+            if info.is_dir() or not _wanted(info.filename): continue
+            yield info.filename, archive.read(info)
+
+def iter_directory(path):
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if not _wanted(name): continue
+            full = os.path.join(root, name)
+            with open(full, "rb") as f: yield os.path.relpath(full, path), f.read()
+
+def iter_sources(paths):
+    for path in paths:
+        if os.path.isdir(path): yield from iter_directory(path)
+        elif zipfile.is_zipfile(path): yield from iter_zip(path)
+        else:
+            with open(path, "rb") as f: yield os.path.basename(path), f.read()
+
+# ==========================================
+# 2. 파싱 (워커 프로세스) + 묶음 저장
+# ==========================================
+def prepare_entry(name, data):
+    """워커에서 실행: 디코딩, 제목, 검색어/사용 현황까지. (이름, (제목, 본문, 스케줄 날짜, digest)) 또는 (이름, 건너뛸 이유)."""
+    text = decode_text(data)
+    if text is None: return name, "인코딩 오류"
+    if not text.strip(): return name, "빈 파일"
+    # 날짜 줄이 없는 파일은 저장 시각 대신 파일 이름을 제목으로 (한꺼번에 넣으면 시각이 겹친다)
+    title, schedule_date = history_title(text, fallback=os.path.splitext(os.path.basename(name))[0])
+    return name, (title, text, schedule_date, history_digest(text, title, schedule_date))
+
+def _prepared(sources, workers):
+    """들어온 순서대로 준비 결과를 돌려준다 (같은 제목이면 나중 파일이 이긴다)."""
+    if workers <= 1:
+        for name, data in sources: yield prepare_entry(name, data)
+        return
+    window = workers * INFLIGHT_PER_WORKER
+    # fork는 스레드가 많은 프로세스(Streamlit 서버, TTS/키오스크 스레드)에서 잠긴 락을 물려받을 수 있어 spawn으로 띄운다
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending = collections.deque()
+        for name, data in sources:
+            pending.append(pool.submit(prepare_entry, name, data))
+            if len(pending) >= window: yield pending.popleft().result()
+        while pending: yield pending.popleft().result()
+
+def import_sources(sources, db_path=HISTORY_DB, workers=None, batch_size=BATCH_SIZE, on_progress=None):
+    """(이름, 바이트) 목록을 보관함에 저장. batch_size개마다 한 트랜잭션. {"files", "saved", "skipped": [(이름, 이유)]}
+    Streamlit 스크립트 안에서는 import_in_subprocess를 쓴다 (spawn 워커가 앱 스크립트를 __main__으로 다시 import하므로)."""
+    if workers is None: workers = os.cpu_count() or 1
+    saved_at = datetime.datetime.now(KST).isoformat()
+    result = {"files": 0, "saved": 0, "skipped": []}
+    batch = []
+    def flush():
+        result["saved"] += save_history_entries(batch, db_path, saved_at)
+        batch.clear()
+        if on_progress: on_progress(result)
+
+    for name, entry in _prepared(sources, workers):
+        result["files"] += 1
+        if isinstance(entry, str): result["skipped"].append((name, entry)); continue
+        batch.append(entry)
+        if len(batch) >= batch_size: flush()
+    if batch: flush()
+    return result
+
+# ==========================================
+# 3. 앱에서 부르기 (별도 프로세스)
+# ==========================================
+def import_in_subprocess(paths, db_path=HISTORY_DB, workers=None, on_progress=None):
+    """명령줄을 새 파이썬 프로세스로 실행. 워커 풀은 스레드가 없는 그 프로세스가 띄우므로 Streamlit 서버와 섞이지 않는다.
+    진행 상황은 --json 이 한 줄씩 내보내는 JSON을 읽어 on_progress로 넘긴다."""
+    command = [sys.executable, os.path.abspath(__file__), *paths, "--db", os.path.abspath(db_path), "--json"]
+    if workers is not None: command += ["--workers", str(workers)]
+    result = None
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding="utf-8") as process:
+        for line in process.stdout:
+            result = json.loads(line)
+            if on_progress: on_progress(result)
+        error = process.stderr.read()
+    if process.returncode != 0 or result is None: raise RuntimeError(f"일괄 가져오기 실패: {error.strip()}")
+    result["skipped"] = [tuple(item) for item in result["skipped"]]
+    return result
+
+# ==========================================
+# 4. 명령줄
+# ==========================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seminar Schedule 보관함 일괄 가져오기")
+    parser.add_argument("paths", nargs="+", help="폴더, zip 또는 .txt 파일")
+    parser.add_argument("--db", default=HISTORY_DB)
+    parser.add_argument("--workers", type=int, default=None, help="파싱 프로세스 수 (기본: CPU 수, 1이면 프로세스 없이)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="트랜잭션당 저장 수")
+    parser.add_argument("--json", action="store_true", help="묶음마다 진행 상황 JSON 한 줄 (마지막 줄이 최종 결과)")
+    args = parser.parse_args(argv)
+
+    missing = [path for path in args.paths if not os.path.exists(path)]
+    if missing: parser.error(f"경로 없음: {', '.join(missing)}")
+    if args.json:
+        emit = lambda r: print(json.dumps(r, ensure_ascii=False), flush=True)
+        emit(import_sources(iter_sources(args.paths), db_path=args.db, workers=args.workers, batch_size=args.batch_size, on_progress=emit))
+        return 0
+    result = import_sources(iter_sources(args.paths), db_path=args.db, workers=args.workers, batch_size=args.batch_size,
+                            on_progress=lambda r: print(f"\r저장 {r['saved']}건", end="", file=sys.stderr))
+    print(file=sys.stderr)
+    print(f"파일 {result['files']}개 중 {result['saved']}건 저장, {len(result['skipped'])}건 건너뜀")
+    for name, reason in result["skipped"]: print(f"  건너뜀: {name} ({reason})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""로비 화면용 정적 타임라인 스냅샷 (스케줄 버전 + 분당 1회 렌더링, 디스크 캐시).
+
+스냅샷 폴더는 표준 라이브러리 HTTP 서버(static_server)로 따로 제공한다. 로비 화면은 http://서버:포트/ 를 열면
+Streamlit 프런트엔드 없이 미리 그려 둔 HTML만 받아 간다. 화면 수가 늘어도 서버 비용은 파일 전송뿐이다.
+포트는 서버 설정으로만 연다: 앱에서는 SEMINAR_KIOSK_PORT가 있을 때만, 명령줄은 --port (기본 8502).
+주소는 기본 127.0.0.1이므로 다른 컴퓨터의 로비 화면에 보내려면 SEMINAR_KIOSK_HOST=0.0.0.0 (또는 --host).
+
+    python kiosk_snapshot.py schedule.txt            # 원본 파일(또는 폴더)을 감시하며 static/kiosk 에 계속 기록 + 제공
+    python kiosk_snapshot.py schedule.txt --once     # 지금 한 장만
+"""
+import argparse
+import datetime
+import hashlib
+import html
+import logging
+import os
+import sys
+import threading
+import time
+
+import plotly.offline
+
+from schedule_core import KST, ScheduleBroadcast
+from schedule_figure import BG_COLOR, FONT_FAMILY, build_figure, visible_window
+from static_server import StaticServer
+
+# ==========================================
+# 1. 설정
+# ==========================================
+KIOSK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "kiosk")
+KIOSK_INDEX = "index.html"
+# 스냅샷 폴더를 제공하는 HTTP 서버 주소 (Streamlit 포트와 별개). 앱에서는 포트를 설정했을 때만 연다
+KIOSK_HOST = os.environ.get("SEMINAR_KIOSK_HOST", "127.0.0.1")
+KIOSK_PORT = int(os.environ["SEMINAR_KIOSK_PORT"]) if os.environ.get("SEMINAR_KIOSK_PORT") else None
+KIOSK_CLI_PORT = 8502
+# plotly.js는 한 번만 옆에 써 두고 모든 스냅샷이 같은 파일을 참조 (브라우저 캐시)
+PLOTLY_JS = "plotly.min.js"
+# 버전/분이 바뀌었는지 확인하는 간격. 렌더링은 (버전, 분)이 바뀔 때만
+KIOSK_POLL_SECONDS = 5
+# 화면이 새 스냅샷을 받아 가는 간격 (meta refresh)
+KIOSK_REFRESH_SECONDS = 15
+# (버전, 분)별 스냅샷 파일은 최근 것만 남긴다
+KIOSK_KEEP_FILES = 10
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+# 2. 렌더링 (서버 모드와 같은 build_figure, 상호작용 없는 정적 그림)
+# ==========================================
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<meta http-equiv="refresh" content="{refresh}">
+<title>Seminar Schedule {stamp}</title>
+<link href="https://fonts.googleapis.com/css2?family=Do+Hyeon&display=swap" rel="stylesheet">
+<style>
+  html, body {{ margin: 0; background: {bg}; color: white; font-family: '{font}', sans-serif; }}
+  .stamp {{ position: fixed; top: 8px; right: 16px; font-size: 28px; }}
+</style>
+<script src="{plotly_js}"></script>
+</head>
+<body>
+<div class="stamp">{stamp} 기준</div>
+<div id="timeline"></div>
+<script>
+  const figure = {figure_json};
+  Plotly.newPlot("timeline", figure.data, figure.layout, {{staticPlot: true, responsive: true}});
+</script>
+</body>
+</html>
+"""
+
+def snapshot_key(schedule, now):
+    return schedule.version, now.strftime("%Y-%m-%d %H:%M")
+
+def snapshot_filename(key):
+    return f"{hashlib.sha256('|'.join(key).encode('utf-8')).hexdigest()[:16]}.html"
+
+def render_snapshot(schedule, now):
+    """전체 장소, 지금 기준 시간 창의 타임라인 HTML 한 장."""
+    fig = build_figure(schedule.view(schedule.locations, visible_window(now)), now)
+    return PAGE_TEMPLATE.format(
+        refresh=KIOSK_REFRESH_SECONDS, stamp=html.escape(now.strftime("%H:%M")), bg=BG_COLOR, font=FONT_FAMILY,
+        plotly_js=PLOTLY_JS, figure_json=fig.to_json().replace("</", "<\\/"))
+
+def _write(path, text):
+    part = f"{path}.part"
+    with open(part, "w", encoding="utf-8") as f: f.write(text)
+    os.replace(part, path)
+
+# ==========================================
+# 3. 디스크 캐시 + 백그라운드 갱신
+# ==========================================
+class KioskSnapshots:
+    """방송 스케줄을 (버전, 분)당 한 번 HTML로 그려 directory에 두고, index.html을 최신 스냅샷으로 바꾼다.
+    start()/stop()은 갱신 스레드만 켜고 끈다. directory를 제공하는 HTTP 서버는 port가 있을 때 serve()로 따로 띄운다."""
+
+    def __init__(self, broadcast, directory=KIOSK_DIR, host=KIOSK_HOST, port=KIOSK_PORT):
+        self.broadcast = broadcast
+        self.directory = directory
+        self.updated_at = None
+        self._last_key = None
+        self._lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        # index.html은 매번 바뀌므로 화면이 새로고침할 때마다 확인하게 한다 (바뀌지 않았으면 304)
+        self.server = StaticServer(directory, host, port, name="kiosk", cache_control="no-cache") if port is not None else None
+        os.makedirs(directory, exist_ok=True)
+
+    def update(self, now=None):
+        """필요할 때만 렌더링. 새 스냅샷을 썼으면 True."""
+        # 원본 감시 중이면 열린 Streamlit 세션이 없어도 여기서 반영
+        self.broadcast.refresh_source()
+        schedule = self.broadcast.current()
+        if not schedule: return False
+        now = now or datetime.datetime.now(KST)
+        key = snapshot_key(schedule, now)
+        with self._lock:
+            if key == self._last_key: return False
+            path = os.path.join(self.directory, snapshot_filename(key))
+            # 재시작 직후 같은 분이면 디스크에 남은 스냅샷을 그대로 쓴다
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f: page = f.read()
+            else:
+                self._ensure_plotly_js()
+                page = render_snapshot(schedule, now)
+                _write(path, page)
+                self._evict()
+            _write(os.path.join(self.directory, KIOSK_INDEX), page)
+            self._last_key = key
+            self.updated_at = now
+            return True
+
+    def _ensure_plotly_js(self):
+        path = os.path.join(self.directory, PLOTLY_JS)
+        if not os.path.exists(path): _write(path, plotly.offline.get_plotlyjs())
+
+    def _evict(self):
+        with os.scandir(self.directory) as it:
+            snapshots = [(entry.stat().st_mtime, entry.path) for entry in it
+                         if entry.is_file() and entry.name.endswith(".html") and entry.name != KIOSK_INDEX]
+        for _, path in sorted(snapshots)[:-KIOSK_KEEP_FILES]:
+            try: os.remove(path)
+            except FileNotFoundError: pass
+
+    def _run(self):
+        while not self._stop.is_set():
+            try: self.update()
+            except Exception: logger.warning("키오스크 스냅샷 실패", exc_info=True)
+            self._stop.wait(KIOSK_POLL_SECONDS)
+
+    def serve(self):
+        """스냅샷 폴더를 제공하는 HTTP 서버를 (아직 없으면) 띄운다. 포트를 설정하지 않았으면 아무것도 하지 않는다."""
+        if self.server is not None: self.server.start()
+        return self
+
+    @property
+    def error(self):
+        return self.server.error if self.server is not None else None
+
+    def start(self):
+        """갱신 스레드를 띄운다. stop() 직후라 이전 스레드가 아직 살아 있으면 끝나길 기다렸다가 새로 띄운다."""
+        with self._thread_lock:
+            if self.running: return self
+            if self._thread is not None: self._thread.join()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="kiosk-snapshot", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """갱신만 멈춘다 (HTTP 서버는 설정으로 연 것이므로 그대로 둔다)."""
+        self._stop.set()
+
+    def close(self):
+        self.stop()
+        if self.server is not None: self.server.stop()
+
+    def url(self, host=None):
+        """로비 화면이 열 주소. HTTP 서버가 없으면 None."""
+        return self.server.url(host) if self.server is not None and self.server.running else None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_kiosk_service(broadcast):
+    """프로세스 전체에서 하나 (Streamlit 재실행 사이에도 유지). HTTP 서버는 SEMINAR_KIOSK_PORT가 있을 때 처음 만들 때 띄우고,
+    갱신 시작/정지는 호출한 쪽에서."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = KioskSnapshots(broadcast).serve()
+            if _service.error: logger.warning(_service.error)
+        return _service
+
+# ==========================================
+# 4. 명령줄 (Streamlit 없이 원본 파일 -> 스냅샷)
+# ==========================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seminar Schedule 키오스크 스냅샷")
+    parser.add_argument("path", help="스케줄 텍스트 파일 또는 .txt가 든 폴더")
+    parser.add_argument("--out", default=KIOSK_DIR, help="스냅샷 폴더 (기본: static/kiosk)")
+    parser.add_argument("--once", action="store_true", help="한 장만 쓰고 끝내기")
+    parser.add_argument("--host", default=KIOSK_HOST, help="HTTP 서버 주소 (기본: SEMINAR_KIOSK_HOST 또는 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=KIOSK_PORT or KIOSK_CLI_PORT, help=f"HTTP 서버 포트 (기본: SEMINAR_KIOSK_PORT 또는 {KIOSK_CLI_PORT})")
+    args = parser.parse_args(argv)
+
+    broadcast = ScheduleBroadcast()
+    broadcast.watch(args.path)
+    kiosk = KioskSnapshots(broadcast, args.out, args.host, args.port)
+    if args.once:
+        if not kiosk.update():
+            print(f"파싱된 이벤트 없음: {args.path}", file=sys.stderr)
+            return 1
+        print(os.path.join(args.out, KIOSK_INDEX))
+        return 0
+    if kiosk.serve().error:
+        print(kiosk.error, file=sys.stderr)
+        return 1
+    print(f"로비 화면 주소: {kiosk.url()}", file=sys.stderr)
+    try:
+        while True:
+            if kiosk.update(): print(f"{kiosk.updated_at.strftime('%H:%M:%S')} 스냅샷 갱신", file=sys.stderr)
+            time.sleep(KIOSK_POLL_SECONDS)
+    except KeyboardInterrupt:
+        kiosk.close()
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import contextlib
+import cProfile
+import datetime
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+# ==========================================
+# 1. 설정 (환경 변수 또는 사이드바 토글로 켬)
+# ==========================================
+PROFILE_ENV = "SEMINAR_PROFILE"
+PROFILE_LOG_ENV = "SEMINAR_PROFILE_LOG"
+PROFILE_DIR = "profiles"
+WINDOW = 200
+
+# 재실행 하나 = 스레드 하나이므로 측정 중인 실행은 스레드별로 보관
+_local = threading.local()
+_lock = threading.Lock()
+_samples = defaultdict(lambda: deque(maxlen=WINDOW))
+
+def env_enabled():
+    return os.environ.get(PROFILE_ENV, "").lower() not in ("", "0", "false", "no")
+
+def env_log_path():
+    return os.environ.get(PROFILE_LOG_ENV) or None
+
+# ==========================================
+# 2. 단계 측정
+# ==========================================
+def begin_run(enabled):
+    _local.run = {} if enabled else None
+
+def is_active():
+    return getattr(_local, "run", None) is not None
+
+@contextlib.contextmanager
+def stage(name):
+    """측정 중이 아니면 아무것도 하지 않는다. 같은 이름이 여러 번 불리면 시간을 더한다 (ms)."""
+    run = getattr(_local, "run", None)
+    if run is None:
+        yield
+        return
+    start = time.perf_counter()
+    try: yield
+    finally: run[name] = run.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+def record(name, value):
+    run = getattr(_local, "run", None)
+    if run is not None: run[name] = value
+
+def end_run(log_path=None):
+    """이번 실행 결과를 이동 창에 넣고, log_path가 있으면 JSONL로 한 줄 추가."""
+    run = getattr(_local, "run", None)
+    _local.run = None
+    if not run: return run
+    with _lock:
+        for name, value in run.items(): _samples[name].append(value)
+    if log_path:
+        line = json.dumps({"ts": datetime.datetime.now().isoformat(timespec="seconds"), **{k: round(v, 3) for k, v in run.items()}}, ensure_ascii=False)
+        with _lock:
+            with open(log_path, "a", encoding="utf-8") as f: f.write(line + "\n")
+    return run
+
+def _percentile(sorted_values, q):
+    if not sorted_values: return 0.0
+    k = (len(sorted_values) - 1) * q
+    lo = int(k); hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+def summary():
+    """[{단계, 횟수, p50, p95, 최근}] (이름이 _bytes로 끝나면 크기, 나머지는 ms)."""
+    with _lock: snapshot = {name: list(values) for name, values in _samples.items()}
+    rows = []
+    for name, values in snapshot.items():
+        ordered = sorted(values)
+        rows.append({"단계": name, "횟수": len(values), "p50": round(_percentile(ordered, 0.5), 2), "p95": round(_percentile(ordered, 0.95), 2), "최근": round(values[-1], 2)})
+    return rows
+
+def reset():
+    with _lock: _samples.clear()
+
+# ==========================================
+# 3. 1회 cProfile 덤프
+# ==========================================
+def start_profile():
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+def stop_profile(profiler, directory=PROFILE_DIR):
+    profiler.disable()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"rerun-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.prof")
+    profiler.dump_stats(path)
+    return path
@@ -0,0 +1,81 @@
+"""스케줄 파일을 파싱해 장소별 상태나 JSON을 출력 (Streamlit/pandas/plotly 없이 표준 라이브러리만).
+
+    python schedule_cli.py schedule.txt              # 지금 기준 장소별 상태
+    python schedule_cli.py schedule.txt --at 14:30   # 오늘 14:30 기준
+    python schedule_cli.py schedule.txt --json       # 이벤트 + 상태 + 충돌 JSON (cron/다른 도구용)
+    cat schedule.txt | python schedule_cli.py -
+"""
+import argparse
+import datetime
+import json
+import sys
+
+from schedule_core import KST, LOCATION_STATUS, TEXT_ENCODINGS, decode_text, load_schedule, shorten_location
+
+def parse_at(value):
+    """'HH:MM'이면 오늘(KST) 그 시각, 아니면 ISO 날짜시각 (타임존이 없으면 KST)."""
+    try:
+        clock = datetime.datetime.strptime(value, "%H:%M").time()
+        return datetime.datetime.combine(datetime.datetime.now(KST).date(), clock, tzinfo=KST)
+    except ValueError: pass
+    try: at = datetime.datetime.fromisoformat(value)
+    except ValueError: raise argparse.ArgumentTypeError(f"시각 형식 오류: {value} (HH:MM 또는 YYYY-MM-DD HH:MM)")
+    return at if at.tzinfo else at.replace(tzinfo=KST)
+
+def read_text(path):
+    """파일(또는 표준 입력)을 감시 폴더와 같은 규칙(UTF-8, BOM 제거, CP949 순)으로 읽는다. 못 읽으면 None."""
+    if path == "-": return decode_text(sys.stdin.buffer.read())
+    with open(path, "rb") as f: return decode_text(f.read())
+
+def event_json(event):
+    return {
+        "id": event.id, "location": event.location, "staff": event.staff, "office": event.office, "aide": event.aide,
+        "title": event.title, "remark": event.remark,
+        "setup": event.setup.isoformat(), "start": event.start.isoformat(), "end": event.end.isoformat(),
+    }
+
+def schedule_json(schedule, now):
+    statuses = schedule.location_statuses(now)
+    return {
+        "now": now.isoformat(timespec="seconds"),
+        "version": schedule.version,
+        "locations": [{"location": loc, "short": shorten_location(loc), "status": statuses[loc]} for loc in schedule.locations],
+        "events": [event_json(event) for event in schedule.events.values()],
+        "conflicts": conflicts_json(schedule.conflicts),
+    }
+
+def conflicts_json(report):
+    return {
+        "total": report.total,
+        "items": [{"kind": c.kind, "key": c.key, "first": c.first.id, "second": c.second.id, "start": c.start.isoformat(), "end": c.end.isoformat()} for c in report.conflicts],
+    }
+
+def print_statuses(schedule, now):
+    print(f"{now.strftime('%Y-%m-%d %H:%M')} 기준 (이벤트 {len(schedule.events)}개, 장소 {len(schedule.locations)}곳)")
+    statuses = schedule.location_statuses(now)
+    width = max((len(loc) for loc in schedule.locations), default=0)
+    for loc in schedule.locations:
+        print(f"  {loc:<{width}}  {LOCATION_STATUS[statuses[loc]][0]}")
+    report = schedule.conflicts
+    if report.total: print(f"일정 충돌 {report.total}건")
+    for c in report.conflicts:
+        print(f"  [{c.kind}] {c.key} {c.start.strftime('%H:%M')}~{c.end.strftime('%H:%M')}: {c.first.location} {c.first.title} / {c.second.location} {c.second.title}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seminar Schedule 파서/상태 출력")
+    parser.add_argument("path", help="스케줄 텍스트 파일 (- 이면 표준 입력)")
+    parser.add_argument("--at", type=parse_at, help="기준 시각 (HH:MM 또는 YYYY-MM-DD HH:MM, 기본: 지금)")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    text = read_text(args.path)
+    if text is None: print(f"인코딩 오류: {args.path} ({', '.join(TEXT_ENCODINGS)}로 읽을 수 없음)", file=sys.stderr); return 1
+    schedule = load_schedule(text)
+    now = args.at or datetime.datetime.now(KST)
+    if args.json: json.dump(schedule_json(schedule, now), sys.stdout, ensure_ascii=False, indent=2); print()
+    elif not schedule: print("파싱된 이벤트 없음", file=sys.stderr); return 1
+    else: print_statuses(schedule, now)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from schedule_core import IMMINENT_SECONDS, PAST_COLOR, shorten_location
+
+# ==========================================
+# 1. 열 기반 막대 모델 (스케줄 버전당 1회)
+# ==========================================
+# 우선순위 순서. 장소 배지는 막대별 코드의 최댓값으로 정한다
+STATUS_KEYS = ("대기", "종료", "셋팅임박", "셋팅중", "ON AIR")
+KST_OFFSET_MS = 9 * 3600 * 1000
+COLUMNS_CACHE_MAX = 8
+
+_columns_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+class EventColumns:
+    """막대를 NumPy 배열 열로 보관. 시각은 epoch ms(int64), 장소/색/툴팁은 표의 번호로만 들고 있다."""
+    __slots__ = ("locations", "short_names", "palette", "hover", "conflicted", "last_finish", "start", "finish", "is_setup", "loc", "color", "text", "event")
+
+    def __init__(self, index):
+        bars = index._bars
+        n = len(bars)
+        self.locations = list(index.locations)
+        loc_code = {loc: i for i, loc in enumerate(self.locations)}
+        self.short_names = np.array([shorten_location(loc) for loc in self.locations], dtype=object)
+
+        palette = {PAST_COLOR: 0}
+        event_code = {}
+        hover = []
+        for _, _, _, row in bars:
+            palette.setdefault(row['ColorCode'], len(palette))
+            if row['EventId'] not in event_code:
+                event_code[row['EventId']] = len(hover)
+                hover.append(row['Event'].hover)
+        self.palette = np.array(list(palette), dtype=object)
+        # customdata는 트레이스에 2차원 배열 그대로 넘긴다 (이벤트당 한 줄)
+        self.hover = np.empty((len(hover), 8), dtype=object)
+        if hover: self.hover[:] = hover
+        conflict_ids = index.conflicts.event_ids
+        self.conflicted = np.fromiter((event_id in conflict_ids for event_id in event_code), bool, len(event_code))
+
+        self.start = np.fromiter((round(bar[0] * 1000) for bar in bars), np.int64, n)
+        self.finish = np.fromiter((round(bar[1] * 1000) for bar in bars), np.int64, n)
+        self.is_setup = np.fromiter((bar[2] for bar in bars), bool, n)
+        self.loc = np.fromiter((loc_code[bar[3]['Task']] for bar in bars), np.int32, n)
+        self.color = np.fromiter((palette[bar[3]['ColorCode']] for bar in bars), np.int32, n)
+        self.text = np.array([bar[3]['BarText'] for bar in bars], dtype=object)
+        self.event = np.fromiter((event_code[bar[3]['EventId']] for bar in bars), np.int32, n)
+
+        self.last_finish = np.full(len(self.locations), np.iinfo(np.int64).min, dtype=np.int64)
+        np.maximum.at(self.last_finish, self.loc, self.finish)
+
+    def select(self, positions):
+        """막대 위치(ScheduleView.positions, 색인이 이분 탐색으로 고른 것)만 남긴 사본 (표는 공유)."""
+        take = np.asarray(positions, dtype=np.intp)
+        part = object.__new__(EventColumns)
+        for name in ("locations", "short_names", "palette", "hover", "conflicted", "last_finish"): setattr(part, name, getattr(self, name))
+        for name in ("start", "finish", "is_setup", "loc", "color", "text", "event"): setattr(part, name, getattr(self, name)[take])
+        return part
+
+    def __len__(self):
+        return len(self.start)
+
+    # ==========================================
+    # 2. now 기준 일괄 계산
+    # ==========================================
+    def location_statuses(self, now):
+        """장소별 배지 상태 키 (ScheduleIndex.location_status와 같은 규칙, 한 번의 배열 연산)."""
+        t = int(now.timestamp() * 1000)
+        covers = (self.start <= t) & (self.finish > t)
+        code = np.zeros(len(self), dtype=np.int8)
+        code[self.is_setup & (self.start > t) & (self.start <= t + IMMINENT_SECONDS * 1000)] = 2
+        code[covers & self.is_setup] = 3
+        code[covers & ~self.is_setup] = 4
+        best = np.zeros(len(self.locations), dtype=np.int8)
+        np.maximum.at(best, self.loc, code)
+        best[(best == 0) & (self.last_finish <= t)] = 1
+        return {loc: STATUS_KEYS[c] for loc, c in zip(self.locations, best.tolist())}
+
+    def split_at(self, now):
+        """지난 막대는 회색, now에 걸친 막대는 [start, now) 회색 + [now, finish) 원래 색으로 나눈 열 묶음.
+        px.timeline에 그대로 넘길 수 있도록 시각은 KST 벽시계 datetime64로 돌려준다."""
+        t = int(now.timestamp() * 1000)
+        past = self.finish <= t
+        straddle = (self.start < t) & ~past
+
+        start = np.concatenate([self.start, np.full(np.count_nonzero(straddle), t, dtype=np.int64)])
+        finish = np.concatenate([np.where(straddle, t, self.finish), self.finish[straddle]])
+        color = np.concatenate([np.where(past | straddle, 0, self.color), self.color[straddle]])
+        text = np.concatenate([np.where(straddle, "", self.text), self.text[straddle]])
+        loc = np.concatenate([self.loc, self.loc[straddle]])
+        event = np.concatenate([self.event, self.event[straddle]])
+        return {
+            "Start": (start + KST_OFFSET_MS).astype("datetime64[ms]"),
+            "Finish": (finish + KST_OFFSET_MS).astype("datetime64[ms]"),
+            "ShortTask": self.short_names[loc],
+            "BarText": text,
+            "ColorCode": self.palette[color],
+            "Event": event,
+            "Conflict": self.conflicted[event],
+        }
+
+# ==========================================
+# 3. 캐시 (ScheduleIndex 버전당 1회 변환)
+# ==========================================
+def get_event_columns(index):
+    with _cache_lock:
+        columns = _columns_cache.get(index.version)
+        if columns is not None:
+            _columns_cache.move_to_end(index.version)
+            return columns
+    columns = EventColumns(index)
+    with _cache_lock:
+        _columns_cache[index.version] = columns
+        while len(_columns_cache) > COLUMNS_CACHE_MAX: _columns_cache.popitem(last=False)
+    return columns
+
+def view_columns(schedule):
+    """(색인 전체 열, 화면에 그릴 열). ScheduleView면 그 장소/창만 잘라낸다."""
+    index = getattr(schedule, "index", schedule)
+    columns = get_event_columns(index)
+    if index is schedule: return columns, columns
+    return columns, columns.select(schedule.positions)
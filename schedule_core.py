@@ -0,0 +1,890 @@
+import bisect
+import datetime
+import functools
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict, defaultdict, namedtuple
+
+# ==========================================
+# 1. 기본 설정 & 정규식 (모듈 로드시 1회 컴파일)
+# ==========================================
+try:
+    from zoneinfo import ZoneInfo
+    KST = ZoneInfo('Asia/Seoul')
+except (ImportError, KeyError):
+    # tzdata가 없는 환경(Windows 등). 한국은 서머타임이 없으므로 고정 오프셋으로 같다
+    KST = datetime.timezone(datetime.timedelta(hours=9), 'KST')
+
+SECTION_SPLIT_RE = re.compile(r'={5,}')
+TIME_RE = re.compile(r'(\d{1,2})시(?:(\d{1,2})분)?')
+DATE_RE = re.compile(r'(\d{1,2})\.(\d{1,2})')
+SHORT_LOCATION_RE = re.compile(r'(\d+)\s*([가-힣])')
+TITLE_DATE_RE = re.compile(r'(\d{1,2})\.(\d{1,2})\s*\(([월화수목금토일])\)')
+
+COLORS = {
+    "BLUE_MAIN": "#5E7CE2", "BLUE_SETUP": "#AAB8E8",
+    "ORANGE_MAIN": "#E6A85E", "ORANGE_SETUP": "#F2D1A8",
+    "GREEN_MAIN": "#76C48C", "GREEN_SETUP": "#B5E2C1",
+    "GRAY_MAIN": "#9E9E9E", "GRAY_SETUP": "#E0E0E0"
+}
+PAST_COLOR = "#4A4A4A"
+
+# ==========================================
+# 2. 섹션 캐시 (Streamlit 재실행 사이에도 모듈은 유지됨)
+# ==========================================
+SECTION_CACHE_MAX = 16384
+# 장소 이름별 짧은 이름/색 메모 (장소 종류는 많지 않음)
+LOCATION_MEMO_MAX = 4096
+
+# 텍스트 버전별 파싱 결과/색인. 세션(운영자, 수신 화면)마다 텍스트가 달라도 서로 밀어내지 않도록 몇 개 보관
+TEXT_CACHE_MAX = 8
+
+_section_cache = OrderedDict()
+_parse_cache = OrderedDict()
+_index_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_MISSING = object()
+
+def _cache_get(cache, key):
+    """LRU 조회 (없으면 _MISSING). _cache_lock 안에서 호출."""
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING: cache.move_to_end(key)
+    return value
+
+def _cache_put(cache, key, value, limit):
+    cache[key] = value
+    while len(cache) > limit: cache.popitem(last=False)
+
+def section_hash(section):
+    return hashlib.blake2b(section.encode('utf-8'), digest_size=16).hexdigest()
+
+def clear_parse_cache():
+    with _cache_lock:
+        _section_cache.clear()
+        _parse_cache.clear()
+        _index_cache.clear()
+
+# ==========================================
+# 3. 데이터 파싱
+# ==========================================
+def parse_time_str(time_str):
+    try:
+        time_str = time_str.replace(" ", "")
+        match = TIME_RE.search(time_str)
+        if match:
+            hour = int(match.group(1))
+            minute = int(match.group(2)) if match.group(2) else 0
+            if 0 <= hour <= 23 and 0 <= minute <= 59:
+                return datetime.time(hour, minute)
+    except: return None
+    return None
+
+@functools.lru_cache(maxsize=LOCATION_MEMO_MAX)
+def shorten_location(loc_name):
+    match = SHORT_LOCATION_RE.search(loc_name)
+    if match: return f"{match.group(1)}{match.group(2)}"
+    return loc_name[:2]
+
+# 장소 분류 -> 색 이름. 이름에 든 글자로 나누며 위에서부터 먼저 맞는 것 (색과 사용 현황이 같은 분류를 쓴다)
+LOCATION_CATEGORIES = (("소", "소회의실", "BLUE"), ("세", "세미나실", "ORANGE"), ("간", "간담회실", "GREEN"))
+OTHER_CATEGORY = ("기타", "GRAY")
+
+@functools.lru_cache(maxsize=LOCATION_MEMO_MAX)
+def _location_category(loc_name):
+    for marker, category, color in LOCATION_CATEGORIES:
+        if marker in loc_name: return category, color
+    return OTHER_CATEGORY
+
+def location_category(loc_name):
+    """'제1소회의실' -> '소회의실'. 분류되지 않으면 '기타'."""
+    return _location_category(loc_name)[0]
+
+@functools.lru_cache(maxsize=LOCATION_MEMO_MAX)
+def get_color_for_location(loc_name, is_setup):
+    return COLORS[f"{_location_category(loc_name)[1]}_{'SETUP' if is_setup else 'MAIN'}"]
+
+class Event:
+    """섹션 하나의 원본 필드만 담은 레코드. 캐시에 공유되므로 만든 뒤 수정하지 않는다.
+    툴팁 필드, 막대 행, 안내용 dict 같은 파생 값은 필요할 때 만든다 (툴팁 필드는 한 번만 만들어 보관)."""
+    __slots__ = ("id", "date", "setup", "start", "end", "location", "staff", "office", "aide", "title", "remark", "_hover")
+
+    def __init__(self, id, date, setup, start, end, location, staff, office, aide, title, remark):
+        self.id = id; self.date = date
+        self.setup = setup; self.start = start; self.end = end
+        self.location = location; self.staff = staff
+        self.office = office; self.aide = aide; self.title = title; self.remark = remark
+        self._hover = None
+
+    def __repr__(self):
+        return f"Event({self.location!r}, {self.setup:%m-%d %H:%M}~{self.start:%H:%M}, {self.title!r})"
+
+    @property
+    def hover(self):
+        """툴팁 필드 (schedule_figure.HOVER_TEMPLATE 순서: 장소, 의원실, 제목, 셋팅, 시작, 담당자, 방송, 방송 글자색)."""
+        if self._hover is None:
+            remark_color = "#D32F2F" if "생중계" in self.remark else "#388E3C"
+            self._hover = (self.location, self.office, self.title, self.setup.strftime('%H:%M'), self.start.strftime('%H:%M'), self.staff, self.remark, remark_color)
+        return self._hover
+
+    @property
+    def staff_display(self):
+        return self.staff.replace(",", "<br>")
+
+    def bars(self):
+        """(셋팅 막대 행, 본행사 막대 행). 행은 색인을 만들 때만 생성한다."""
+        return (
+            dict(Task=self.location, Start=self.setup, Finish=self.start, Resource="셋팅", Status="대기", ColorCode=get_color_for_location(self.location, True), BarText="SET", EventId=self.id, Event=self),
+            dict(Task=self.location, Start=self.start, Finish=self.end, Resource="본행사", Status="대기", ColorCode=get_color_for_location(self.location, False), BarText=self.staff_display, EventId=self.id, Event=self),
+        )
+
+    def js_event(self):
+        return {"id": self.id, "location": self.location, "setup_ts": self.setup.timestamp() * 1000, "staff": self.staff}
+
+def parse_section(section, today_kst, event_id=None):
+    """섹션 하나를 Event로 변환 (시작/셋팅 시각이 없으면 None).
+    event_id는 안내 중복 방지용 식별자 (기본값: 섹션 내용 해시)."""
+    lines = [l.strip() for l in section.strip().split('\n') if l.strip()]
+    date_obj = today_kst; start = setup = None
+    location = "미정"; staff = office = aide = title = ""; remark = "일반"
+
+    if len(lines) > 0:
+        line1 = lines[0]
+        date_match = DATE_RE.search(line1)
+        if date_match:
+            try: date_obj = datetime.date(today_kst.year, int(date_match.group(1)), int(date_match.group(2)))
+            except ValueError: date_obj = today_kst
+
+        if '/' in line1:
+            times_part = line1.split(')')[-1] if ')' in line1 else line1
+            parts = times_part.split('/')
+            start = parse_time_str(parts[0])
+            if len(parts) > 1: setup = parse_time_str(parts[1])
+
+    if len(lines) > 1:
+        line2 = lines[1]
+        if '-' in line2: parts = line2.split('-'); location = parts[0].strip(); staff = parts[1].strip()
+        else: location = line2
+
+    if len(lines) > 2:
+        line3 = lines[2]
+        if '/' in line3: parts = line3.split('/'); office = parts[0].strip(); aide = parts[1].strip()
+        else: office = line3
+
+    if len(lines) > 3: title = lines[3]
+    if len(lines) > 4:
+        raw_broadcast = "\n".join(lines[4:])
+        if "생중계" in raw_broadcast: remark = "📡 생중계"
+        elif "녹화" in raw_broadcast: remark = "📹 녹화"
+        else: remark = "-"
+
+    if not (start and setup): return None
+
+    start_dt = datetime.datetime.combine(date_obj, start, tzinfo=KST)
+    setup_dt = datetime.datetime.combine(date_obj, setup, tzinfo=KST)
+    return Event(event_id or section_hash(section), date_obj, setup_dt, start_dt, start_dt + datetime.timedelta(hours=2), location, staff, office, aide, title, remark)
+
+def _parse_section_cached(section, today_kst):
+    digest = section_hash(section)
+    key = (today_kst, digest)
+    with _cache_lock:
+        # 시각이 없는 섹션(None)도 캐시한다
+        parsed = _cache_get(_section_cache, key)
+    if parsed is not _MISSING: return parsed
+    parsed = parse_section(section, today_kst, event_id=digest)
+    with _cache_lock: _cache_put(_section_cache, key, parsed, SECTION_CACHE_MAX)
+    return parsed
+
+def _parse_text(raw_text):
+    today_kst = datetime.datetime.now(KST).date()
+    parse_key = (today_kst, section_hash(raw_text))
+    with _cache_lock:
+        result = _cache_get(_parse_cache, parse_key)
+    if result is not _MISSING: return result
+
+    events = []
+    for section in SECTION_SPLIT_RE.split(raw_text):
+        if not section.strip(): continue
+        event = _parse_section_cached(section, today_kst)
+        if event is not None: events.append(event)
+
+    # 막대 행/안내 dict는 캐시에 두지 않고 현재 텍스트 버전에서만 만든다
+    schedule_data = tuple(row for event in events for row in event.bars())
+    js_events = tuple(event.js_event() for event in events)
+    result = (parse_key, schedule_data, js_events)
+    with _cache_lock: _cache_put(_parse_cache, parse_key, result, TEXT_CACHE_MAX)
+    return result
+
+def extract_schedule(raw_text):
+    """붙여넣은 텍스트 전체를 파싱해 (막대 행 목록, 안내용 이벤트 목록). 바뀐 섹션만 다시 파싱하고, 최근에 본 텍스트면 그 결과를 재사용."""
+    _, schedule_data, js_events = _parse_text(raw_text)
+    return list(schedule_data), list(js_events)
+
+# ==========================================
+# 4. 상태 엔진 (스케줄 버전당 1회 색인, 매 틱은 이분 탐색)
+# ==========================================
+IMMINENT_SECONDS = 30 * 60
+
+LOCATION_STATUS = {
+    "ON AIR": ("🔴 ON AIR", "#FF5252"),
+    "셋팅중": ("🟡 셋팅중", "#FFD740"),
+    "셋팅임박": ("🟠 셋팅임박", "#FFAB40"),
+    "종료": ("⚫ 종료", "#9E9E9E"),
+    "대기": ("⚪ 대기", "gray"),
+}
+
+class _IntervalIndex:
+    """시작 시각으로 정렬된 구간 목록. prefix_max_finish[i]는 앞에서 i+1개 구간의 최대 종료 시각."""
+    __slots__ = ("starts", "prefix_max_finish")
+
+    def __init__(self, intervals):
+        intervals = sorted(intervals)
+        self.starts = [s for s, _ in intervals]
+        self.prefix_max_finish = []
+        running = float("-inf")
+        for _, f in intervals:
+            running = max(running, f)
+            self.prefix_max_finish.append(running)
+
+    def covers(self, t):
+        i = bisect.bisect_right(self.starts, t)
+        return i > 0 and self.prefix_max_finish[i - 1] > t
+
+    def starts_within(self, t0, t1):
+        # t0 < start <= t1 인 구간이 있는지
+        return bisect.bisect_right(self.starts, t1) > bisect.bisect_right(self.starts, t0)
+
+class ScheduleIndex:
+    """파싱된 막대 행을 장소별로 색인. 행 딕셔너리는 공유 객체이므로 수정하지 않는다."""
+
+    def __init__(self, schedule_data, js_events=(), version=""):
+        self.version = version
+        self.rows = tuple(schedule_data)
+        self.js_events = tuple(js_events)
+        self.locations = list(dict.fromkeys(row['Task'] for row in self.rows))
+        # 이벤트 id -> Event (툴팁 필드는 이벤트당 한 번만 만들어 전송)
+        self.events = {row['EventId']: row['Event'] for row in self.rows}
+
+        setups = {loc: [] for loc in self.locations}
+        mains = {loc: [] for loc in self.locations}
+        self._last_finish = {loc: float("-inf") for loc in self.locations}
+        self._bars = []
+        for row in self.rows:
+            start_ts = row['Start'].timestamp(); finish_ts = row['Finish'].timestamp()
+            is_setup = row['Resource'] == "셋팅"
+            (setups if is_setup else mains)[row['Task']].append((start_ts, finish_ts))
+            self._last_finish[row['Task']] = max(self._last_finish[row['Task']], finish_ts)
+            self._bars.append((start_ts, finish_ts, is_setup, row))
+
+        self._setups = {loc: _IntervalIndex(v) for loc, v in setups.items()}
+        self._mains = {loc: _IntervalIndex(v) for loc, v in mains.items()}
+
+        # 화면 창(window) 조회용: 장소별 시작 시각 정렬 막대 + 가장 긴 막대 길이
+        # 막대는 self._bars 안의 위치로 들고 있다 (열 모델도 같은 순서라 위치를 그대로 쓴다)
+        self._positions_by_location = {loc: [] for loc in self.locations}
+        for i, bar in enumerate(self._bars): self._positions_by_location[bar[3]['Task']].append(i)
+        for positions in self._positions_by_location.values(): positions.sort(key=lambda i: self._bars[i][0])
+        self._bar_starts = {loc: [self._bars[i][0] for i in positions] for loc, positions in self._positions_by_location.items()}
+        self._max_bar_seconds = max((bar[1] - bar[0] for bar in self._bars), default=0.0)
+        self._conflicts = None
+
+    def __bool__(self):
+        return bool(self.rows)
+
+    @property
+    def conflicts(self):
+        """담당자/장소 중복 검사 결과 ConflictReport (버전당 첫 조회 때 1회 계산)."""
+        if self._conflicts is None: self._conflicts = find_conflicts(self.events.values())
+        return self._conflicts
+
+    def location_status(self, location, now):
+        """장소 배지 상태 키 (ON AIR > 셋팅중 > 셋팅임박 > 종료 > 대기)."""
+        t = now.timestamp()
+        if self._mains[location].covers(t): return "ON AIR"
+        if self._setups[location].covers(t): return "셋팅중"
+        if self._setups[location].starts_within(t, t + IMMINENT_SECONDS): return "셋팅임박"
+        if self._last_finish[location] <= t: return "종료"
+        return "대기"
+
+    def location_statuses(self, now):
+        return {loc: self.location_status(loc, now) for loc in self.locations}
+
+    def positions_in_window(self, locations, t0=None, t1=None):
+        """[t0, t1)과 겹치는 막대의 self._bars 위치, 오름차순 (장소별 이분 탐색, 막대 길이 상한으로 시작 범위를 좁힘).
+        t0/t1이 없으면 그 장소의 막대 전부."""
+        positions = []
+        for loc in locations:
+            candidates = self._positions_by_location[loc]
+            if t0 is not None:
+                starts = self._bar_starts[loc]
+                lo = bisect.bisect_right(starts, t0 - self._max_bar_seconds)
+                hi = bisect.bisect_left(starts, t1)
+                candidates = (i for i in candidates[lo:hi] if self._bars[i][1] > t0)
+            positions.extend(candidates)
+        positions.sort()
+        return positions
+
+    def view(self, locations=None, window=None):
+        """장소 일부(페이지)와 시간 창만 담은 가벼운 보기. 렌더링 쪽은 ScheduleIndex와 같은 방식으로 쓴다."""
+        return ScheduleView(self, list(locations) if locations is not None else self.locations, window)
+
+class ScheduleView:
+    """ScheduleIndex의 장소 페이지 + 시간 창. 창 밖 막대는 만들지도 보내지도 않는다."""
+
+    def __init__(self, index, locations, window=None):
+        self.index = index
+        self.locations = locations
+        self.window = window
+        # 뼈대(레이아웃)는 장소 목록에만 의존하므로 버전에는 장소만 반영
+        self.version = f"{index.version}|{section_hash(chr(10).join(locations))}"
+        self.js_events = index.js_events
+
+    # 열 모델(서버 그림)은 positions만 쓰고, 행/이벤트는 실시간 모드 페이로드처럼 필요할 때만 만든다
+    @functools.cached_property
+    def positions(self):
+        if self.window is None: return self.index.positions_in_window(self.locations)
+        t0, t1 = self.window
+        return self.index.positions_in_window(self.locations, t0.timestamp(), t1.timestamp())
+
+    @functools.cached_property
+    def rows(self):
+        # 막대 위치는 색인 행 순서와 같다
+        return tuple(self.index.rows[i] for i in self.positions)
+
+    @functools.cached_property
+    def events(self):
+        return {row['EventId']: row['Event'] for row in self.rows}
+
+    def __bool__(self):
+        return bool(self.locations)
+
+    @property
+    def conflicts(self):
+        return self.index.conflicts
+
+    def location_status(self, location, now):
+        return self.index.location_status(location, now)
+
+    def location_statuses(self, now):
+        return {loc: self.index.location_status(loc, now) for loc in self.locations}
+
+def page_locations(locations, per_page, now, rotate_seconds):
+    """장소를 per_page개씩 나눠 rotate_seconds마다 다음 페이지로. (이번 페이지 장소, 페이지 번호, 전체 페이지 수)"""
+    if not per_page or per_page >= len(locations): return list(locations), 0, 1
+    pages = -(-len(locations) // per_page)
+    page = int(now.timestamp() // max(rotate_seconds, 1)) % pages
+    return list(locations[page * per_page:(page + 1) * per_page]), page, pages
+
+def load_schedule(raw_text):
+    """텍스트 -> ScheduleIndex. 같은 스케줄 버전이면 색인을 다시 만들지 않는다."""
+    parse_key, schedule_data, js_events = _parse_text(raw_text)
+    with _cache_lock:
+        index = _cache_get(_index_cache, parse_key)
+    if index is not _MISSING: return index
+    today_kst, text_hash = parse_key
+    index = ScheduleIndex(schedule_data, js_events, version=f"{today_kst.isoformat()}:{text_hash}")
+    with _cache_lock: _cache_put(_index_cache, parse_key, index, TEXT_CACHE_MAX)
+    return index
+
+# ==========================================
+# 5. 보관함 (SQLite, WAL 모드)
+# ==========================================
+HISTORY_FILE = "schedule_history.json"
+HISTORY_DB = "schedule_history.db"
+# 검색 색인/사용 현황 스키마 버전 (PRAGMA user_version). 올리면 다음 연결 때 전체를 다시 만든다
+HISTORY_SCHEMA_VERSION = 4
+TERM_SPLIT_RE = re.compile(r'[\s,/·()\[\]<>"\'~:;!?]+')
+WEEKDAYS = "월화수목금토일"
+
+_history_ready = set()
+_history_lock = threading.Lock()
+
+def history_title(text, now=None, fallback=None):
+    """첫 줄의 'M.D(요일)'로 제목을 만들고, 없으면 fallback(또는 첫 줄 앞부분 + 저장 시각). (제목, 스케줄 날짜 또는 None)"""
+    now = now or datetime.datetime.now(KST)
+    first_line = text.split('\n')[0].strip()
+    match = TITLE_DATE_RE.search(first_line)
+    if match:
+        title = f"{match.group(1)}월 {match.group(2)}일 {match.group(3)}요일"
+        schedule_date = _schedule_date(int(match.group(1)), int(match.group(2)), match.group(3), now)
+        return title, schedule_date and schedule_date.isoformat()
+    return fallback or f"{first_line[:20]}... ({now.strftime('%H:%M')})", None
+
+def _schedule_date(month, day, weekday, now):
+    """요일이 맞는 해를 고른다 (올해, 내년, 그다음 지난 6년). 예전 스케줄을 가져와도 요일별 통계가 맞도록. 날짜가 틀리면 None."""
+    candidates = []
+    for year in (now.year, now.year + 1, *range(now.year - 1, now.year - 7, -1)):
+        try: candidates.append(datetime.date(year, month, day))
+        except ValueError: pass
+    for date in candidates:
+        if WEEKDAYS[date.weekday()] == weekday: return date
+    return candidates[0] if candidates and candidates[0].year == now.year else None
+
+def migrate_json_history(conn, json_path=HISTORY_FILE):
+    """예전 schedule_history.json을 1회 이관하고 .migrated로 이름을 바꾼다."""
+    if not os.path.exists(json_path): return 0
+    try:
+        with open(json_path, "r", encoding="utf-8") as f: history = json.load(f)
+    except (OSError, ValueError): return 0
+    saved_at = datetime.datetime.now(KST).isoformat()
+    rows = [(title, text, history_title(text)[1], saved_at) for title, text in history.items()]
+    with conn:
+        conn.executemany("INSERT OR IGNORE INTO schedules (title, body, schedule_date, saved_at) VALUES (?, ?, ?, ?)", rows)
+        for title, text, schedule_date, _ in rows: _index_history(conn, title, text, schedule_date)
+    os.replace(json_path, json_path + ".migrated")
+    return len(rows)
+
+def _connect_history(db_path=HISTORY_DB):
+    conn = sqlite3.connect(db_path, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with _history_lock:
+        if db_path not in _history_ready:
+            with conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS schedules (title TEXT PRIMARY KEY, body TEXT NOT NULL, schedule_date TEXT, saved_at TEXT NOT NULL)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_schedules_date ON schedules (schedule_date)")
+                # 역색인: 검색어(소문자) -> 보관함 제목. term이 키 앞쪽이라 접두어 검색이 색인 범위 조회 한 번
+                conn.execute("CREATE TABLE IF NOT EXISTS schedule_terms (term TEXT NOT NULL, title TEXT NOT NULL, field TEXT NOT NULL, PRIMARY KEY (term, field, title)) WITHOUT ROWID")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_schedule_terms_title ON schedule_terms (title)")
+                # 사용 현황: 보관함 항목별 (날짜, 종류, 키)당 분 단위 점유 비트(16진수). 조회는 기간 범위 읽기 + 날짜별 합집합
+                conn.execute("CREATE TABLE IF NOT EXISTS usage_daily (title TEXT NOT NULL, usage_date TEXT NOT NULL, kind TEXT NOT NULL, key TEXT NOT NULL, category TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (title, usage_date, kind, key)) WITHOUT ROWID")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_usage_daily_kind_date ON usage_daily (kind, usage_date)")
+            migrate_json_history(conn, os.path.join(os.path.dirname(db_path), HISTORY_FILE))
+            if conn.execute("PRAGMA user_version").fetchone()[0] < HISTORY_SCHEMA_VERSION: rebuild_history_index(conn)
+            _history_ready.add(db_path)
+    return conn
+
+# ==========================================
+# 5-1. 보관함 검색 (담당자/의원실/장소/제목 역색인)
+# ==========================================
+def _suffixes(term):
+    """'제1소회의실' -> 제1소회의실, 1소회의실, 소회의실, 회의실, 의실. 접두어 검색과 합쳐 '소회의실', '의원실' 같은 복합어 뒷부분도 찾는다."""
+    return {term[i:] for i in range(len(term) - 1)}
+
+def _terms(value):
+    return {suffix for term in TERM_SPLIT_RE.split(value.lower()) if len(term) >= 2 for suffix in _suffixes(term)}
+
+def archive_events(text, schedule_date=None):
+    """보관함 본문의 이벤트 목록. 'M.D'는 스케줄 날짜의 해로 읽는다 (없으면 올해)."""
+    reference = datetime.date.fromisoformat(schedule_date) if schedule_date else datetime.datetime.now(KST).date()
+    # 보관함 본문이 현재 화면의 섹션 캐시를 밀어내지 않도록 캐시 없이 파싱
+    events = (parse_section(section, reference) for section in SECTION_SPLIT_RE.split(text) if section.strip())
+    return [event for event in events if event is not None]
+
+def history_terms(events, title=""):
+    """이벤트 목록 -> (검색어, 분야) 집합. 분야는 담당자/의원실/장소/제목/보관함."""
+    terms = {(term, "보관함") for term in _terms(title)}
+    for event in events:
+        terms.update((term, "담당자") for name in split_staff(event.staff) for term in _suffixes(name.lower()) | {name.lower()})
+        terms.update((term, "의원실") for term in _terms(event.office) | _terms(event.aide))
+        # 장소는 이름(과 그 뒷부분), 짧은 이름, 분류(소회의실/세미나실/간담회실/기타)로
+        terms.update((term, "장소") for term in _terms(event.location) | {shorten_location(event.location).lower(), location_category(event.location)})
+        terms.update((term, "제목") for term in _terms(event.title))
+    return terms
+
+def history_digest(text, title="", schedule_date=None):
+    """한 번 파싱해 (검색어 집합, 사용 현황 행 목록). 일괄 가져오기는 워커에서 미리 만들어 넘긴다."""
+    events = archive_events(text, schedule_date)
+    return history_terms(events, title), usage_rows(events)
+
+def _index_history(conn, title, text, schedule_date=None, digest=None):
+    """digest를 미리 계산해 넘기면(일괄 가져오기 워커) 여기서는 파싱하지 않는다."""
+    terms, usage = digest or history_digest(text, title, schedule_date)
+    conn.execute("DELETE FROM schedule_terms WHERE title = ?", (title,))
+    conn.executemany("INSERT OR IGNORE INTO schedule_terms (term, field, title) VALUES (?, ?, ?)", ((term, field, title) for term, field in terms))
+    conn.execute("DELETE FROM usage_daily WHERE title = ?", (title,))
+    conn.executemany("INSERT INTO usage_daily (title, usage_date, kind, key, category, value) VALUES (?, ?, ?, ?, ?, ?)", ((title,) + row for row in usage))
+
+def rebuild_history_index(conn):
+    """저장된 모든 본문으로 색인과 사용 현황을 다시 만든다 (스키마 버전이 바뀌었거나 예전 DB일 때 1회)."""
+    with conn:
+        conn.execute("DELETE FROM schedule_terms")
+        conn.execute("DELETE FROM usage_daily")
+        for title, text, schedule_date in conn.execute("SELECT title, body, schedule_date FROM schedules").fetchall():
+            _index_history(conn, title, text, schedule_date)
+        conn.execute(f"PRAGMA user_version = {HISTORY_SCHEMA_VERSION}")
+
+def search_history(query, field=None, db_path=HISTORY_DB):
+    """공백으로 나눈 검색어를 모두 포함하는 보관함 제목을 최신순으로. field로 분야를 좁힐 수 있다.
+    색인에 단어의 뒷부분들도 들어 있어 접두어 검색이 곧 단어 안 부분 일치다 ('회의실' -> '제1소회의실')."""
+    words = [word for word in TERM_SPLIT_RE.split(query.lower()) if word]
+    if not words: return load_history_titles(db_path)
+    sql = "SELECT title FROM schedule_terms WHERE term >= ? AND term < ?" + (" AND field = ?" if field else "")
+    conn = _connect_history(db_path)
+    try:
+        titles = None
+        for word in words:
+            params = (word, word + "\U0010ffff") + ((field,) if field else ())
+            matched = {row[0] for row in conn.execute(sql, params)}
+            titles = matched if titles is None else titles & matched
+            if not titles: return []
+        return sorted(titles, reverse=True)
+    finally: conn.close()
+
+def load_history_titles(db_path=HISTORY_DB):
+    """사이드바용 제목 목록만 (본문은 읽지 않음)."""
+    conn = _connect_history(db_path)
+    try: return [row[0] for row in conn.execute("SELECT title FROM schedules ORDER BY title DESC")]
+    finally: conn.close()
+
+def load_history_text(title, db_path=HISTORY_DB):
+    conn = _connect_history(db_path)
+    try:
+        row = conn.execute("SELECT body FROM schedules WHERE title = ?", (title,)).fetchone()
+        return row[0] if row else None
+    finally: conn.close()
+
+def _upsert_history(conn, title, text, schedule_date, saved_at, digest=None):
+    conn.execute(
+        "INSERT INTO schedules (title, body, schedule_date, saved_at) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(title) DO UPDATE SET body = excluded.body, schedule_date = excluded.schedule_date, saved_at = excluded.saved_at",
+        (title, text, schedule_date, saved_at))
+    _index_history(conn, title, text, schedule_date, digest)
+
+def save_to_history(text, db_path=HISTORY_DB):
+    title, schedule_date = history_title(text)
+    conn = _connect_history(db_path)
+    try:
+        with conn: _upsert_history(conn, title, text, schedule_date, datetime.datetime.now(KST).isoformat())
+    finally: conn.close()
+    return title
+
+def save_history_entries(entries, db_path=HISTORY_DB, saved_at=None):
+    """(제목, 본문, 스케줄 날짜, history_digest 결과 또는 None) 목록을 한 트랜잭션으로 저장 (일괄 가져오기용)."""
+    saved_at = saved_at or datetime.datetime.now(KST).isoformat()
+    conn = _connect_history(db_path)
+    try:
+        with conn:
+            for title, text, schedule_date, digest in entries: _upsert_history(conn, title, text, schedule_date, saved_at, digest)
+    finally: conn.close()
+    return len(entries)
+
+def delete_history(key, db_path=HISTORY_DB):
+    conn = _connect_history(db_path)
+    try:
+        with conn:
+            conn.execute("DELETE FROM schedules WHERE title = ?", (key,))
+            conn.execute("DELETE FROM schedule_terms WHERE title = ?", (key,))
+            conn.execute("DELETE FROM usage_daily WHERE title = ?", (key,))
+    finally: conn.close()
+
+# ==========================================
+# 5-2. 보관함 사용 현황 (저장할 때 날짜별 시간대 배열로 미리 계산)
+# ==========================================
+USAGE_KINDS = ("장소", "담당자")
+# 셋팅 리드타임(본행사 시작 - 셋팅 시작) 분포: 10분 칸, 마지막 칸은 120분 이상
+USAGE_LEAD_BIN_MINUTES = 10
+USAGE_LEAD_BINS = 13
+
+def _lead_kind(kind):
+    return f"{kind}:셋팅"
+
+def usage_lead_labels():
+    last = USAGE_LEAD_BIN_MINUTES * (USAGE_LEAD_BINS - 1)
+    return [f"{m}~{m + USAGE_LEAD_BIN_MINUTES}분" for m in range(0, last, USAGE_LEAD_BIN_MINUTES)] + [f"{last}분 이상"]
+
+def usage_rows(events):
+    """이벤트 -> (날짜, 종류, 키, 분류, 값) 행 목록.
+    장소/담당자는 셋팅 시작~종료를 점유로 보고 하루 1440분 비트(비트 i = 0시 i분)를 16진수로 (자정 넘어가는 부분은 자름).
+    비트라서 같은 날짜가 여러 보관함 항목에 있어도 조회 때 OR로 합치면 한 번만 센다.
+    '장소:셋팅'/'담당자:셋팅'은 셋팅 리드타임 분포 칸별 건수 JSON."""
+    occupied = defaultdict(int)
+    leads = defaultdict(lambda: [0] * USAGE_LEAD_BINS)
+    for event in events:
+        day = event.setup.date().isoformat()
+        begin = event.setup.hour * 60 + event.setup.minute
+        end = min(begin + int((event.end - event.setup).total_seconds() // 60), 1440)
+        keys = [("담당자", name) for name in split_staff(event.staff)]
+        if event.location != UNASSIGNED_LOCATION: keys.append(("장소", event.location))
+        lead = int((event.start - event.setup).total_seconds() // 60)
+        for kind, key in keys:
+            if end > begin: occupied[(day, kind, key)] |= ((1 << (end - begin)) - 1) << begin
+            if lead >= 0: leads[(day, _lead_kind(kind), key)][min(lead // USAGE_LEAD_BIN_MINUTES, USAGE_LEAD_BINS - 1)] += 1
+    rows = [(day, kind, key, format(mask, "x")) for (day, kind, key), mask in occupied.items()]
+    rows += [(day, kind, key, json.dumps(bins)) for (day, kind, key), bins in leads.items()]
+    return [(day, kind, key, location_category(key) if kind.startswith("장소") else "", value) for day, kind, key, value in rows]
+
+def usage_keys(kind="장소", db_path=HISTORY_DB):
+    """보관함에 사용 기록이 있는 장소(또는 담당자) 이름 목록."""
+    conn = _connect_history(db_path)
+    try: return [row[0] for row in conn.execute("SELECT DISTINCT key FROM usage_daily WHERE kind = ? ORDER BY key", (kind,))]
+    finally: conn.close()
+
+def usage_summary(start, end, kind="장소", keys=None, db_path=HISTORY_DB):
+    """[start, end] 기간(날짜 포함)의 사용 현황. keys로 장소/담당자를 좁힐 수 있다 (None이면 전체).
+    heatmap[요일][시]는 그 요일 그 시간에 평균 몇 곳(명)이 사용 중이었는지 (키 하나면 점유율 0~1).
+    요일별 평균의 분모는 그 요일에 스케줄이 있었던 날 수.
+    같은 날짜가 여러 보관함 항목(수정본 등)에 있으면 점유는 (날짜, 키)별 분 단위 합집합, 리드타임은 칸별 최댓값으로 합친다."""
+    period = (start.isoformat(), end.isoformat())
+    wanted = set(keys) if keys is not None else None
+    heatmap = [[0] * 24 for _ in range(7)]
+    totals = defaultdict(int); categories = defaultdict(int)
+    lead = [0] * USAGE_LEAD_BINS
+    conn = _connect_history(db_path)
+    try:
+        dates = [row[0] for row in conn.execute(
+            "SELECT DISTINCT usage_date FROM usage_daily WHERE kind IN (?, ?) AND usage_date BETWEEN ? AND ?", USAGE_KINDS + period)]
+        masks = defaultdict(int); key_categories = {}
+        for usage_date, key, category, value in conn.execute(
+                "SELECT usage_date, key, category, value FROM usage_daily WHERE kind = ? AND usage_date BETWEEN ? AND ?", (kind,) + period):
+            if wanted is not None and key not in wanted: continue
+            masks[(usage_date, key)] |= int(value, 16); key_categories[key] = category
+        leads = defaultdict(lambda: [0] * USAGE_LEAD_BINS)
+        for usage_date, key, value in conn.execute(
+                "SELECT usage_date, key, value FROM usage_daily WHERE kind = ? AND usage_date BETWEEN ? AND ?", (_lead_kind(kind),) + period):
+            if wanted is not None and key not in wanted: continue
+            leads[(usage_date, key)] = [max(a, b) for a, b in zip(leads[(usage_date, key)], json.loads(value))]
+    finally: conn.close()
+
+    hour_mask = (1 << 60) - 1
+    for (usage_date, key), mask in masks.items():
+        row = heatmap[datetime.date.fromisoformat(usage_date).weekday()]
+        for hour in range(24): row[hour] += bin((mask >> (hour * 60)) & hour_mask).count("1")
+        used = bin(mask).count("1")
+        totals[key] += used; categories[key_categories[key]] += used
+    for bins in leads.values():
+        for i, count in enumerate(bins): lead[i] += count
+
+    weekday_days = [0] * 7
+    for usage_date in dates: weekday_days[datetime.date.fromisoformat(usage_date).weekday()] += 1
+    return {
+        "days": len(dates),
+        "weekday_days": weekday_days,
+        "heatmap": [[minutes / (60 * days) if days else 0.0 for minutes in row] for row, days in zip(heatmap, weekday_days)],
+        # 사용 시간(시간 단위), 많은 순
+        "totals": {key: minutes / 60 for key, minutes in sorted(totals.items(), key=lambda item: -item[1])},
+        "categories": {category: minutes / 60 for category, minutes in sorted(categories.items(), key=lambda item: -item[1])},
+        "lead": lead,
+    }
+
+# ==========================================
+# 6. 방송 모드 (운영자 1명이 발행, 여러 화면이 공유)
+# ==========================================
+BROADCAST_ARTIFACTS_MAX = 32
+
+class ScheduleBroadcast:
+    """프로세스 전체에서 공유하는 발행 스케줄. 뷰어는 파싱/색인/그림을 다시 만들지 않고 가져다 쓴다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.revision = 0
+        self.text = ""
+        self.published_at = None
+        self._schedule = None
+        self._artifacts = OrderedDict()
+        self.source = None
+
+    def publish(self, text):
+        """같은 내용이면 아무것도 하지 않는다. 새 버전이면 revision을 올리고 공유 산출물을 비운다."""
+        schedule = load_schedule(text)
+        with self._lock:
+            if self._schedule is not None and self._schedule.version == schedule.version: return self.revision
+            self.text = text
+            self._schedule = schedule
+            self.revision += 1
+            self.published_at = datetime.datetime.now(KST)
+            self._artifacts.clear()
+            return self.revision
+
+    def current(self):
+        """발행된 ScheduleIndex (없으면 None). 날짜가 바뀌면 같은 텍스트를 오늘 기준으로 한 번 다시 색인."""
+        with self._lock:
+            schedule, text = self._schedule, self.text
+        if schedule is None: return None
+        today = datetime.datetime.now(KST).date().isoformat()
+        if not schedule.version.startswith(today):
+            refreshed = load_schedule(text)
+            with self._lock:
+                if self._schedule is schedule:
+                    self._schedule = refreshed
+                    self._artifacts.clear()
+                schedule = self._schedule
+        return schedule
+
+    def watch(self, path):
+        """원본 파일/폴더 감시를 켠다 (빈 값이면 끈다). 같은 경로면 기존 감시를 그대로 둔다."""
+        with self._lock:
+            if not path: self.source = None
+            elif self.source is None or self.source.path != path: self.source = SourceWatcher(path)
+            return self.source
+
+    def refresh_source(self):
+        """감시 중인 원본이 바뀌었으면 발행. 어느 세션(운영자/수신 화면)의 재실행이든 먼저 본 쪽이 한 번 발행한다."""
+        source = self.source
+        if source is None: return None
+        text = source.poll()
+        if text is not None: self.publish(text)
+        return text
+
+    def artifact(self, name, key, build):
+        """(현재 버전, name, key)당 build()를 한 번만 실행해 모든 뷰어가 결과를 공유."""
+        schedule = self.current()
+        cache_key = (schedule.version if schedule else None, name, key)
+        with self._lock:
+            if cache_key in self._artifacts:
+                self._artifacts.move_to_end(cache_key)
+                return self._artifacts[cache_key]
+        value = build()
+        with self._lock:
+            self._artifacts[cache_key] = value
+            while len(self._artifacts) > BROADCAST_ARTIFACTS_MAX: self._artifacts.popitem(last=False)
+        return value
+
+# ==========================================
+# 7. 일정 충돌 검사 (스윕 라인)
+# ==========================================
+# 목록은 시작이 이른 순으로 이만큼만 만든다 (전체 건수와 강조할 일정은 따로 정확히 센다)
+CONFLICT_LIST_MAX = 200
+UNASSIGNED_LOCATION = "미정"
+
+# kind는 "담당자" 또는 "장소", key는 담당자 이름/장소 이름, [start, end)는 겹치는 구간
+Conflict = namedtuple("Conflict", "kind key first second start end")
+ConflictReport = namedtuple("ConflictReport", "conflicts total event_ids")
+
+def split_staff(staff):
+    """'홍길동, 김철수' -> ['홍길동', '김철수'] (중복 제거, 순서 유지)."""
+    return list(dict.fromkeys(name.strip() for name in staff.split(",") if name.strip()))
+
+def _sorted_intervals(intervals):
+    return sorted(intervals, key=lambda iv: (iv[0], iv[1]))
+
+def _scan(intervals):
+    """겹치는 쌍의 수와, 다른 구간과 한 번이라도 겹치는 이벤트 id (쌍을 만들지 않으므로 O(n log n)).
+    시작 순으로 훑으며 아직 안 끝난 앞 구간의 종료 시각만 힙에 둔다. 뒤 구간과의 겹침은 바로 다음 시작만 보면 된다."""
+    ordered = _sorted_intervals(intervals)
+    ends = []
+    pairs = 0
+    overlapped = set()
+    for i, (start, end, event) in enumerate(ordered):
+        while ends and ends[0] <= start: heapq.heappop(ends)
+        pairs += len(ends)
+        if ends or (i + 1 < len(ordered) and ordered[i + 1][0] < end): overlapped.add(event.id)
+        heapq.heappush(ends, end)
+    return pairs, overlapped
+
+def _pairs(kind, key, intervals, keep=None):
+    """겹치는 쌍을 겹침 시작 순으로 하나씩 (필요한 만큼만 꺼내 쓴다)."""
+    active = []
+    for seq, (start, end, event) in enumerate(_sorted_intervals(intervals)):
+        while active and active[0][0] <= start: heapq.heappop(active)
+        for other_end, _, other in active:
+            if keep is None or keep(other, event): yield Conflict(kind, key, other, event, start, min(end, other_end))
+        heapq.heappush(active, (end, seq, event))
+
+def _different_location(a, b):
+    # 같은 장소 안의 겹침은 장소 충돌로 이미 나온다 (장소 미정끼리는 담당자 충돌로 남김)
+    return a.location != b.location or a.location == UNASSIGNED_LOCATION
+
+def find_conflicts(events, limit=CONFLICT_LIST_MAX):
+    """같은 장소의 세션이 겹치거나, 한 담당자가 동시에 두 일정(셋팅~종료)에 잡힌 경우.
+    ConflictReport(시작 순 충돌 목록 limit건, 전체 건수, 충돌에 걸린 이벤트 id 집합)."""
+    by_location = defaultdict(list)
+    by_staff = defaultdict(list)
+    by_staff_location = defaultdict(list)
+    for event in events:
+        interval = (event.setup, event.end, event)
+        # 장소 미정은 아직 배정 전이라 같은 '미정'끼리 겹쳐도 장소 충돌이 아니다
+        if event.location != UNASSIGNED_LOCATION: by_location[event.location].append(interval)
+        for name in split_staff(event.staff):
+            by_staff[name].append(interval)
+            if event.location != UNASSIGNED_LOCATION: by_staff_location[(name, event.location)].append(interval)
+
+    total = 0
+    event_ids = set()
+    for intervals in list(by_location.values()) + list(by_staff.values()):
+        pairs, overlapped = _scan(intervals)
+        total += pairs; event_ids |= overlapped
+    # 담당자 쌍 중 같은 장소 쌍은 장소 충돌과 중복이므로 건수에서 뺀다
+    total -= sum(_scan(intervals)[0] for intervals in by_staff_location.values())
+
+    streams = [_pairs("장소", location, intervals) for location, intervals in by_location.items()]
+    streams += [_pairs("담당자", name, intervals, _different_location) for name, intervals in by_staff.items()]
+    conflicts = list(itertools.islice(heapq.merge(*streams, key=lambda c: c.start), limit))
+    return ConflictReport(conflicts, total, event_ids)
+
+# ==========================================
+# 8. 원본 파일 감시 (mtime 폴링, 바뀐 섹션만 다시 파싱)
+# ==========================================
+SOURCE_EXTENSIONS = (".txt",)
+# 윈도우 메모장/한글 내보내기 대비
+TEXT_ENCODINGS = ("utf-8-sig", "cp949")
+# 폴더를 감시할 때 파일 사이에 넣는 구분선 (파일 끝 섹션이 다음 파일 첫 섹션과 붙지 않도록)
+SOURCE_SEPARATOR = "\n=====\n"
+
+# added/removed는 섹션 수, locations는 바뀐 섹션이 걸친 장소
+SourceChange = namedtuple("SourceChange", "at revision added removed locations")
+
+def decode_text(data):
+    for encoding in TEXT_ENCODINGS:
+        try: return data.decode(encoding)
+        except UnicodeDecodeError: pass
+    return None
+
+def source_files(path):
+    """.txt 파일이면 그 파일, 폴더면 바로 안의 .txt (이름순). 다른 확장자의 파일은 읽지 않는다."""
+    if not os.path.isdir(path): return [path] if path.lower().endswith(SOURCE_EXTENSIONS) else []
+    return sorted(entry.path for entry in os.scandir(path)
+                  if entry.is_file() and entry.name.lower().endswith(SOURCE_EXTENSIONS) and not entry.name.startswith("."))
+
+def _signature(files):
+    signature = []
+    for name in files:
+        # 편집기가 지웠다 다시 쓰는 순간이면 없는 파일로 본다 (다음 폴링에서 다시 잡힌다)
+        try: stat = os.stat(name)
+        except OSError: continue
+        signature.append((name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+class SourceWatcher:
+    """로컬 파일/폴더를 mtime으로 감시. poll()은 stat만 보고, 바뀌었을 때만 읽어서 섹션 단위로 비교한다.
+    새로 생긴 섹션은 여기서 섹션 캐시에 파싱해 두므로 load_schedule은 캐시 조회만 한다."""
+
+    def __init__(self, path):
+        self.path = path
+        self.revision = 0
+        self.text = None
+        self.change = None
+        self.error = None
+        self._lock = threading.Lock()
+        self._signature = None
+        self._sections = {}
+
+    def poll(self):
+        """내용이 바뀌었으면 새 텍스트, 아니면 None (mtime만 바뀐 저장도 None)."""
+        with self._lock:
+            try: files = source_files(self.path)
+            except OSError as e: self.error = str(e); return None
+            signature = _signature(files)
+            if signature == self._signature: return None
+            self._signature = signature
+            if not signature: self.error = ".txt 파일 없음"; return None
+
+            texts, undecodable = [], []
+            for name, _, _ in signature:
+                try:
+                    with open(name, "rb") as f: text = decode_text(f.read())
+                except OSError: continue
+                # 읽을 수 없는 파일 하나 때문에 폴더 전체를 멈추지 않는다. 나머지는 발행하고 오류로 알린다
+                if text is None: undecodable.append(os.path.basename(name)); continue
+                texts.append(text)
+            self.error = f"인코딩 오류: {', '.join(undecodable)}" if undecodable else None
+            if not texts: return None
+            text = SOURCE_SEPARATOR.join(texts)
+            if text == self.text: return None
+
+            today_kst = datetime.datetime.now(KST).date()
+            # 앞뒤 공백만 다른 섹션은 같은 섹션으로 본다
+            sections = {section_hash(section.strip()): section for section in SECTION_SPLIT_RE.split(text) if section.strip()}
+            added = [sections[digest] for digest in sections.keys() - self._sections.keys()]
+            removed = [self._sections[digest] for digest in self._sections.keys() - sections.keys()]
+            events = (_parse_section_cached(section, today_kst) for section in added + removed)
+            locations = sorted({event.location for event in events if event is not None})
+            self.revision += 1
+            self.change = SourceChange(datetime.datetime.now(KST), self.revision, len(added), len(removed), locations)
+            self.text, self._sections = text, sections
+            return text
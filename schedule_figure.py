@@ -0,0 +1,346 @@
+import datetime
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.utils import PlotlyJSONEncoder
+
+from perf_metrics import stage
+from schedule_columns import view_columns
+from schedule_core import COLORS, IMMINENT_SECONDS, LOCATION_STATUS, PAST_COLOR, WEEKDAYS, get_color_for_location, shorten_location, usage_lead_labels
+
+# ==========================================
+# 1. 타임라인 기본 설정
+# ==========================================
+FONT_FAMILY = "Do Hyeon"
+BG_COLOR = "#1E1E1E"
+START_HOUR = 5
+END_HOUR = 21
+HALF_WINDOW = datetime.timedelta(hours=4)
+WINDOW_MARGIN = datetime.timedelta(hours=1)
+
+BASE_LAYOUT_CACHE_MAX = 32
+CLIENT_TICK_SECONDS = 30
+KST_OFFSET_MS = 9 * 3600 * 1000
+PLOTLY_JS_CDN = "https://cdn.plot.ly/plotly-2.35.2.min.js"
+CONFLICT_COLOR = "#FF1744"
+CONFLICT_LINE_WIDTH = 4
+
+# 툴팁 템플릿은 트레이스당 하나. customdata에는 Event.hover 순서의 필드만 들어간다
+HOVER_TEMPLATE = (
+    "<span style='font-size: 22px; color: #FF007F;'><b>🐻 [%{customdata[0]}]</b></span><br>"
+    "♥ 의원실: %{customdata[1]}<br>"
+    "📝 제　목: %{customdata[2]}<br>"
+    "⏰ 시　간: %{customdata[3]} (셋팅) ~ %{customdata[4]} (시작)<br>"
+    "👤 담당자: %{customdata[5]}<br>"
+    "<span style='color: %{customdata[7]};'><b>📺 방　송: %{customdata[6]}</b></span>"
+    "<extra></extra>"
+)
+
+BAR_STYLE = dict(
+    textposition='inside', insidetextanchor='middle',
+    hovertemplate=HOVER_TEMPLATE,
+    hoverlabel=dict(font_size=20, font_family=FONT_FAMILY, align="left", bgcolor="white", font_color="black"),
+    textfont=dict(size=30, family=FONT_FAMILY, color="black"),
+    marker=dict(line=dict(width=0))
+)
+
+_base_layout_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+# ==========================================
+# 2. 정적 뼈대 (장소 구성 + 날짜당 1회)
+# ==========================================
+def build_base_layout(schedule, today_str):
+    """시간 헤더, 장소 레일/라벨 등 틱마다 변하지 않는 레이아웃을 plain dict로 생성."""
+    shapes = []
+    annotations = []
+
+    for hour in range(START_HOUR, END_HOUR + 1):
+        time_str = f"{hour:02d}:00"
+        x0_time = pd.Timestamp(f"{today_str} {hour:02d}:00")
+        x1_time = pd.Timestamp(f"{today_str} {hour:02d}:59") if hour == END_HOUR else pd.Timestamp(f"{today_str} {hour+1:02d}:00")
+
+        shapes.append(dict(type="rect", xref="x", yref="paper", x0=x0_time, x1=x1_time, y0=1.01, y1=1.10, line=dict(color="white", width=1), fillcolor=BG_COLOR))
+        annotations.append(dict(x=x0_time + (x1_time - x0_time) / 2, y=1.055, xref="x", yref="paper", text=time_str, showarrow=False, yanchor="middle", font=dict(size=26, color="white", family=FONT_FAMILY)))
+
+    rail_x0 = pd.Timestamp(f"{today_str} {START_HOUR:02d}:00")
+    rail_x1 = pd.Timestamp(f"{today_str} {END_HOUR:02d}:00")
+    categories, positions = row_positions(schedule.locations)
+    for i, full_task_name in zip(positions, schedule.locations):
+        short_task = shorten_location(full_task_name)
+        loc_main_color = get_color_for_location(full_task_name, is_setup=False)
+
+        shapes.append(dict(type="rect", xref="x", yref="y", x0=rail_x0, x1=rail_x1, y0=i-0.1, y1=i+0.1, fillcolor="#333333", line=dict(width=0), layer="below"))
+        shapes.append(dict(type="rect", xref="paper", yref="y", x0=-0.07, x1=-0.06, y0=i-0.4, y1=i+0.4, fillcolor=loc_main_color, line=dict(width=0)))
+        annotations.append(dict(x=-0.02, xref="paper", y=i, yref="y", text=f"<b>{short_task}</b>", showarrow=False, font=dict(size=45, color="white", family=FONT_FAMILY), align="right"))
+
+    fig = go.Figure()
+    fig.update_xaxes(
+        type="date", showgrid=True, gridwidth=1, gridcolor='#444',
+        showline=False, ticks="", showticklabels=False, title="",
+        tickformat="%H:%M", dtick=3600000,
+        tickmode='linear', tickangle=0, side="top", automargin=True
+    )
+    # 행 순서를 고정해 두면 창 밖이라 막대가 없는 장소도 자리를 지킨다
+    fig.update_yaxes(
+        type="category", categoryorder="array", categoryarray=categories,
+        showgrid=False, showline=False, showticklabels=False,
+        title="", autorange="reversed", automargin=True
+    )
+    dynamic_height = max(800, len(categories) * 80 + 250)
+    fig.update_layout(
+        barmode="overlay", height=dynamic_height, font=dict(size=14, family=FONT_FAMILY), showlegend=False,
+        paper_bgcolor=BG_COLOR, plot_bgcolor=BG_COLOR, margin=dict(t=120, b=100, l=180, r=10), hoverlabel_align='left',
+        shapes=shapes, annotations=annotations
+    )
+    return fig.layout.to_plotly_json()
+
+def row_positions(locations):
+    """짧은 이름 기준 y축 카테고리와, 장소별 행 번호 (짧은 이름이 같은 장소는 같은 행)."""
+    categories = list(dict.fromkeys(shorten_location(loc) for loc in locations))
+    index = {short: i for i, short in enumerate(categories)}
+    return categories, [index[shorten_location(loc)] for loc in locations]
+
+def get_base_layout(schedule, now):
+    # 뼈대는 장소 구성과 날짜로만 정해진다. 원본이 바뀌어도 장소가 그대로면 새 버전에서 그대로 재사용
+    key = (tuple(schedule.locations), now.strftime("%Y-%m-%d"))
+    with _cache_lock:
+        layout = _base_layout_cache.get(key)
+        if layout is not None:
+            _base_layout_cache.move_to_end(key)
+            return layout
+    layout = build_base_layout(schedule, key[1])
+    with _cache_lock:
+        _base_layout_cache[key] = layout
+        while len(_base_layout_cache) > BASE_LAYOUT_CACHE_MAX: _base_layout_cache.popitem(last=False)
+    return layout
+
+# ==========================================
+# 3. 매 틱 패치 (막대 분할, now 선, 상태 배지)
+# ==========================================
+def build_bar_traces(columns, split):
+    """split은 EventColumns.split_at 결과 (열 이름 -> 배열). DataFrame 없이 px.timeline에 바로 넘긴다.
+    색/툴팁 배열은 요소별 검증을 거치지 않도록 trace dict에 직접 붙인다 (patch_figure도 재검증하지 않음)."""
+    with stage("px.timeline"):
+        bars = px.timeline(
+            split, x_start="Start", x_end="Finish", y="ShortTask",
+            text="BarText", opacity=1.0
+        )
+    trace = dict(bars.data[0].to_plotly_json(), customdata=columns.hover[split['Event']], **BAR_STYLE)
+    # 담당자/장소가 겹치는 일정은 빨간 테두리
+    trace['marker'] = dict(color=split['ColorCode'], line=dict(color=CONFLICT_COLOR, width=np.where(split['Conflict'], CONFLICT_LINE_WIDTH, 0)))
+    return [trace]
+
+def badge_annotation(i, status_key):
+    status_text, status_color = LOCATION_STATUS[status_key]
+    return dict(x=0.98, xref="paper", y=i, yref="y", text=status_text, showarrow=False, font=dict(size=24, color=status_color, family=FONT_FAMILY), align="right", bgcolor=BG_COLOR, bordercolor=status_color, borderwidth=2, borderpad=4)
+
+def status_annotations(schedule, location_statuses):
+    _, positions = row_positions(schedule.locations)
+    return [badge_annotation(i, location_statuses[task]) for i, task in zip(positions, schedule.locations)]
+
+def visible_window(now, center=None, margin=WINDOW_MARGIN):
+    """화면에 보이는 now±4h(이동 시 center±4h)에 여유를 더한 막대 조회 범위."""
+    center = center or now
+    return center - HALF_WINDOW - margin, center + HALF_WINDOW + margin
+
+def patch_figure(base_layout, bar_traces, badges, now, center=None):
+    """캐시된 뼈대는 얕은 복사만 하고 시간에 따라 바뀌는 부분만 덧붙인다 (뼈대는 재검증하지 않음)."""
+    center = center or now
+    layout = dict(base_layout)
+    layout['xaxis'] = dict(base_layout['xaxis'], range=[center - HALF_WINDOW, center + HALF_WINDOW])
+    layout['shapes'] = base_layout['shapes'] + [
+        dict(type="line", xref="x", yref="y domain", x0=now, x1=now, y0=0, y1=1, line=dict(color="red", width=2, dash="solid"))
+    ]
+    layout['annotations'] = base_layout['annotations'] + badges + [
+        dict(x=now, y=1.10, xref="x", yref="paper", text="▼", showarrow=False, font=dict(size=25, color="red"), yshift=0)
+    ]
+    return go.Figure(data=bar_traces, layout=layout, _validate=False)
+
+def build_figure(schedule, now, center=None):
+    """schedule은 ScheduleIndex 또는 ScheduleView (창/페이지로 자른 보기면 그 막대만 그린다)."""
+    with stage("event columns"): columns, visible = view_columns(schedule)
+    with stage("process_progressive_data"):
+        split = visible.split_at(now)
+        location_statuses = columns.location_statuses(now)
+    with stage("layout skeleton (shapes/annotations)"): base_layout = get_base_layout(schedule, now)
+    bar_traces = build_bar_traces(columns, split) if len(visible) else ()
+    with stage("layout patch (now/badges)"): return patch_figure(base_layout, bar_traces, status_annotations(schedule, location_statuses), now, center)
+
+def build_figure_html(fig):
+    """그림을 한 번 직렬화해 plotly.js로 그리는 HTML과 높이. 수신 화면들이 공유하면 화면마다 다시 직렬화하지 않는다
+    (st.plotly_chart는 같은 Figure라도 세션/재실행마다 to_json을 다시 한다)."""
+    figure_json = fig.to_json().replace("</", "<\\/")
+    html = f"""
+    <style>
+        @import url('https://fonts.googleapis.com/css2?family=Do+Hyeon&display=swap');
+        html, body {{ margin: 0; background-color: {BG_COLOR}; }}
+    </style>
+    <script src="{PLOTLY_JS_CDN}"></script>
+    <div id="timeline"></div>
+    <script>
+        const figure = {figure_json};
+        Plotly.newPlot("timeline", figure.data, figure.layout, {{ responsive: true, displaylogo: false }});
+    </script>
+    """
+    return html, fig.layout.height
+
+# ==========================================
+# 4. 브라우저 실시간 모드 (서버 재실행 없이 클라이언트가 now를 진행)
+# ==========================================
+def build_client_payload(schedule, now):
+    """스케줄 버전당 고정된 데이터만 담는다 (now는 브라우저가 계산)."""
+    task_index = {task: i for i, task in enumerate(schedule.locations)}
+    _, positions = row_positions(schedule.locations)
+    locations = [{"row": row, "setups": [], "mains": [], "last": None} for row in positions]
+    event_index = {event_id: i for i, event_id in enumerate(schedule.events)}
+    conflict_ids = schedule.conflicts.event_ids
+    bars = []
+    for row in schedule.rows:
+        start_ms = int(row['Start'].timestamp() * 1000); finish_ms = int(row['Finish'].timestamp() * 1000)
+        is_setup = row['Resource'] == "셋팅"
+        loc = locations[task_index[row['Task']]]
+        loc["setups" if is_setup else "mains"].append([start_ms, finish_ms])
+        loc["last"] = finish_ms if loc["last"] is None else max(loc["last"], finish_ms)
+        bar = {"y": shorten_location(row['Task']), "start": start_ms, "finish": finish_ms, "color": row['ColorCode'], "text": row['BarText'], "event": event_index[row['EventId']]}
+        if row['EventId'] in conflict_ids: bar["conflict"] = True
+        bars.append(bar)
+    return {
+        "layout": get_base_layout(schedule, now),
+        "day": now.strftime("%Y-%m-%d"),
+        "bars": bars,
+        "events": [event.hover for event in schedule.events.values()],
+        "locations": locations,
+        "bar_style": BAR_STYLE,
+        "badge": badge_annotation(0, "대기"),
+        "statuses": {key: list(value) for key, value in LOCATION_STATUS.items()},
+        "past_color": PAST_COLOR,
+        "conflict_line": {"color": CONFLICT_COLOR, "width": CONFLICT_LINE_WIDTH},
+        "half_window_ms": int(HALF_WINDOW.total_seconds() * 1000),
+        "margin_ms": int(WINDOW_MARGIN.total_seconds() * 1000),
+        "imminent_ms": IMMINENT_SECONDS * 1000,
+    }
+
+def build_live_timeline_html(schedule, now):
+    payload = build_client_payload(schedule, now)
+    # 붙여넣은 텍스트에 </script>가 있어도 태그가 닫히지 않도록
+    payload_json = json.dumps(payload, cls=PlotlyJSONEncoder, ensure_ascii=False).replace("</", "<\\/")
+    return f"""
+    <style>
+        @import url('https://fonts.googleapis.com/css2?family=Do+Hyeon&display=swap');
+        html, body {{ margin: 0; background-color: {BG_COLOR}; }}
+    </style>
+    <script src="{PLOTLY_JS_CDN}"></script>
+    <div id="timeline"></div>
+    <script>
+        const payload = {payload_json};
+        const gd = document.getElementById('timeline');
+
+        // Plotly.js는 타임존을 무시하므로 KST 벽시계 문자열로 변환
+        function wall(ms) {{ return new Date(ms + {KST_OFFSET_MS}).toISOString().slice(0, 23); }}
+
+        function buildTrace(nowMs) {{
+            const trace = Object.assign({{ type: 'bar', orientation: 'h', base: [], x: [], y: [], text: [], customdata: [], opacity: 1.0 }}, payload.bar_style);
+            trace.marker = {{ color: [], line: {{ color: payload.conflict_line.color, width: [] }} }};
+            const push = (bar, start, finish, color, text) => {{
+                trace.base.push(wall(start)); trace.x.push(finish - start); trace.y.push(bar.y);
+                trace.marker.color.push(color); trace.text.push(text); trace.customdata.push(payload.events[bar.event]);
+                trace.marker.line.width.push(bar.conflict ? payload.conflict_line.width : 0);
+            }};
+            // 보이는 창(+여유)과 겹치는 막대만 그린다
+            const t0 = nowMs - payload.half_window_ms - payload.margin_ms, t1 = nowMs + payload.half_window_ms + payload.margin_ms;
+            for (const bar of payload.bars) {{
+                if (bar.finish <= t0 || bar.start >= t1) continue;
+                if (bar.finish <= nowMs) push(bar, bar.start, bar.finish, payload.past_color, bar.text);
+                else if (bar.start >= nowMs) push(bar, bar.start, bar.finish, bar.color, bar.text);
+                else {{
+                    push(bar, bar.start, nowMs, payload.past_color, "");
+                    push(bar, nowMs, bar.finish, bar.color, bar.text);
+                }}
+            }}
+            return trace;
+        }}
+
+        function covers(intervals, t) {{ return intervals.some(([s, f]) => s <= t && t < f); }}
+
+        function locationStatus(loc, t) {{
+            if (covers(loc.mains, t)) return "ON AIR";
+            if (covers(loc.setups, t)) return "셋팅중";
+            if (loc.setups.some(([s, f]) => t < s && s <= t + payload.imminent_ms)) return "셋팅임박";
+            if (loc.last <= t) return "종료";
+            return "대기";
+        }}
+
+        function buildLayout(nowMs) {{
+            const base = payload.layout;
+            const nowWall = wall(nowMs);
+            const badges = payload.locations.map(loc => {{
+                const [text, color] = payload.statuses[locationStatus(loc, nowMs)];
+                return Object.assign({{}}, payload.badge, {{ y: loc.row, text: text, bordercolor: color, font: Object.assign({{}}, payload.badge.font, {{ color: color }}) }});
+            }});
+            return Object.assign({{}}, base, {{
+                xaxis: Object.assign({{}}, base.xaxis, {{ range: [wall(nowMs - payload.half_window_ms), wall(nowMs + payload.half_window_ms)] }}),
+                shapes: base.shapes.concat([{{ type: "line", xref: "x", yref: "y domain", x0: nowWall, x1: nowWall, y0: 0, y1: 1, line: {{ color: "red", width: 2, dash: "solid" }} }}]),
+                annotations: base.annotations.concat(badges, [{{ x: nowWall, y: 1.10, xref: "x", yref: "paper", text: "▼", showarrow: false, font: {{ size: 25, color: "red" }}, yshift: 0 }}])
+            }});
+        }}
+
+        function render() {{
+            const nowMs = Date.now();
+            // 날짜가 바뀌면 시간 헤더가 달라지므로 그때만 서버 재실행
+            if (wall(nowMs).slice(0, 10) !== payload.day) {{
+                for (const btn of window.parent.document.querySelectorAll('button')) {{
+                    if (btn.innerText.includes("Refresh Trigger")) {{ btn.click(); return; }}
+                }}
+            }}
+            Plotly.react(gd, [buildTrace(nowMs)], buildLayout(nowMs), {{ responsive: true, displaylogo: false }});
+        }}
+
+        render();
+        setInterval(render, {CLIENT_TICK_SECONDS * 1000});
+    </script>
+    """
+
+# ==========================================
+# 5. 보관함 사용 현황 (usage_summary 결과 -> 그림)
+# ==========================================
+USAGE_HEIGHT = 420
+
+def _usage_layout(fig, **kwargs):
+    fig.update_layout(
+        height=USAGE_HEIGHT, font=dict(size=14, family=FONT_FAMILY, color="white"),
+        paper_bgcolor=BG_COLOR, plot_bgcolor=BG_COLOR, margin=dict(t=40, b=40, l=60, r=10), **kwargs)
+    return fig
+
+def build_usage_heatmap(summary, title=""):
+    """요일 x 시간대 평균 사용 (타임라인과 같은 START_HOUR~END_HOUR 구간)."""
+    hours = range(START_HOUR, END_HOUR + 1)
+    z = [[row[hour] for hour in hours] for row in summary["heatmap"]]
+    weekdays = [f"{day} ({count}일)" for day, count in zip(WEEKDAYS, summary["weekday_days"])]
+    fig = go.Figure(go.Heatmap(
+        z=z, x=[f"{hour:02d}시" for hour in hours], y=weekdays, colorscale="Blues", zmin=0,
+        hovertemplate="%{y} %{x}: 평균 %{z:.2f}<extra></extra>"))
+    fig.update_yaxes(autorange="reversed")
+    return _usage_layout(fig, title=title)
+
+def build_usage_totals(summary, kind="장소"):
+    """키별 총 사용 시간 막대. 장소는 짧은 이름과 타임라인 색 그대로."""
+    keys = list(summary["totals"])
+    if kind == "장소":
+        labels = [shorten_location(key) for key in keys]
+        colors = [get_color_for_location(key, False) for key in keys]
+    else: labels, colors = keys, "#AAAAAA"
+    fig = go.Figure(go.Bar(
+        x=labels, y=list(summary["totals"].values()), marker_color=colors, customdata=keys,
+        hovertemplate="%{customdata}: %{y:.1f}시간<extra></extra>"))
+    return _usage_layout(fig, yaxis_title="사용 시간")
+
+def build_lead_histogram(summary):
+    fig = go.Figure(go.Bar(x=usage_lead_labels(), y=summary["lead"], marker_color=COLORS["BLUE_SETUP"], hovertemplate="%{x}: %{y}건<extra></extra>"))
+    return _usage_layout(fig, yaxis_title="건수", xaxis_title="셋팅 리드타임 (본행사 시작 - 셋팅 시작)")
+
@@ -0,0 +1,106 @@
+"""폴더 하나를 Streamlit 밖에서 제공하는 작은 표준 라이브러리 HTTP 서버 (안내 음성 클립, 키오스크 스냅샷).
+
+Streamlit 정적 파일 서빙은 허용 목록(이미지, 글꼴, pdf, json, xml) 밖의 파일을 text/plain + nosniff로 보내므로
+.mp3/.wav/.html/.js는 브라우저가 재생하거나 열지 못한다. 여기서는 확장자에 맞는 Content-Type과
+바이트 범위 요청(오디오 재생에 필요한 206 응답)을 처리한다.
+"""
+import functools
+import http.server
+import io
+import logging
+import os
+import re
+import socket
+import threading
+
+logger = logging.getLogger(__name__)
+
+RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+
+class StaticHandler(http.server.SimpleHTTPRequestHandler):
+    extensions_map = {
+        **http.server.SimpleHTTPRequestHandler.extensions_map,
+        ".mp3": "audio/mpeg", ".wav": "audio/wav", ".html": "text/html; charset=utf-8", ".js": "text/javascript",
+    }
+
+    def send_response(self, code, message=None):
+        self._code = code
+        super().send_response(code, message)
+
+    def end_headers(self):
+        self.send_header("Accept-Ranges", "bytes")
+        # 아직 합성되지 않은 클립의 404가 캐시되지 않도록 오류 응답은 저장하지 않게 한다
+        self.send_header("Cache-Control", self.server.cache_control if self._code < 400 else "no-store")
+        super().end_headers()
+
+    def send_head(self):
+        match = RANGE_RE.fullmatch(self.headers.get("Range", "").strip())
+        path = self.translate_path(self.path)
+        if not match or not any(match.groups()) or not os.path.isfile(path): return super().send_head()
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if match.group(1):
+                start = int(match.group(1))
+                end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+            else: start, end = max(size - int(match.group(2)), 0), size - 1
+            if start > end:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return None
+            f.seek(start)
+            body = f.read(end - start + 1)
+        self.send_response(206)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def list_directory(self, path):
+        # 폴더 목록은 보여주지 않는다
+        self.send_error(404)
+        return None
+
+    def log_message(self, format, *args):
+        logger.debug("%s %s - %s", self.server.name, self.address_string(), format % args)
+
+class StaticServer:
+    """directory를 host:port로 제공. start()는 여러 번 불러도 한 번만 띄우고, 포트를 못 열면 error에 남긴다."""
+
+    def __init__(self, directory, host, port, name="static", cache_control="no-cache"):
+        self.directory = directory
+        self.host, self.port = host, port
+        self.name = name
+        self.cache_control = cache_control
+        self.error = None
+        self._server = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._server is not None: return self
+            try: server = http.server.ThreadingHTTPServer((self.host, self.port), functools.partial(StaticHandler, directory=self.directory))
+            except OSError as e:
+                self.error = f"{self.name} 서버 {self.host}:{self.port} 열기 실패: {e}"
+                return self
+            server.daemon_threads = True
+            server.name, server.cache_control = self.name, self.cache_control
+            self._server, self.port, self.error = server, server.server_address[1], None
+            threading.Thread(target=server.serve_forever, name=f"{self.name}-http", daemon=True).start()
+        return self
+
+    def stop(self):
+        with self._lock: server, self._server = self._server, None
+        if server is not None:
+            server.shutdown(); server.server_close()
+
+    @property
+    def running(self):
+        return self._server is not None
+
+    def url(self, host=None):
+        """브라우저가 열 주소 (끝에 /). host는 브라우저가 접속한 서버 이름 (없으면 이 컴퓨터 이름)."""
+        if not host: host = self.host if self.host not in ("", "0.0.0.0", "::") else socket.gethostname()
+        return f"http://{host}:{self.port}/"
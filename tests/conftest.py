@@ -0,0 +1,47 @@
+import datetime
+import os
+import random
+import sys
+
+import pytest
+
+# 모듈이 저장소 최상위에 있으므로 어느 폴더에서 pytest를 실행해도 import 되도록
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schedule_core import KST, UNASSIGNED_LOCATION, Event
+
+DAY = datetime.date(2026, 3, 2)
+LOCATIONS = ["제1소회의실", "제2세미나실", "제3간담회실", UNASSIGNED_LOCATION]
+STAFF = ["홍길동", "김철수", "이영희", "박민수"]
+
+def at_minutes(minutes):
+    return datetime.datetime.combine(DAY, datetime.time(minutes // 60, minutes % 60), tzinfo=KST)
+
+@pytest.fixture
+def random_events():
+    """seed별 가상 이벤트 목록을 만드는 함수. 10분 격자라 경계 시각이 자주 겹치고, 길이 0인 셋팅(셋팅 = 시작)도 섞인다."""
+    def make(seed, n=40):
+        rng = random.Random(seed)
+        events = []
+        for i in range(n):
+            start = rng.randrange(8 * 60, 18 * 60, 10)
+            setup = start - rng.choice([0, 10, 30, 60])
+            staff = ", ".join(rng.sample(STAFF, rng.randint(1, 2)))
+            events.append(Event(f"e{i}", DAY, at_minutes(setup), at_minutes(start), at_minutes(start) + datetime.timedelta(hours=2),
+                                rng.choice(LOCATIONS), staff, "김의원실", "", f"토론회 {i}", "일반"))
+        return events
+    return make
+
+@pytest.fixture
+def sample_text():
+    """붙여넣기 형식의 보관함 본문 (3월 2일 월요일, 두 섹션)."""
+    return """3.2(월) 10시0분/9시30분
+제1소회의실 - 홍길동, 김철수
+김의원실 / 이영희
+정책 토론회
+생중계
+=====
+3.2(월) 14시0분/13시0분
+제2세미나실 - 박민수
+박의원실 / 최지우
+예산 간담회"""
@@ -0,0 +1,22 @@
+import json
+
+from benchmark import baseline_document, check_regressions, load_baseline
+
+BASELINE = {"100": {"build_index": {"median_ms": 12.0, "min_ms": 10.0, "peak_kb": 1.0}}}
+
+def _results(min_ms):
+    return {"100": {"build_index": {"median_ms": min_ms, "min_ms": min_ms, "peak_kb": 1.0}}}
+
+def test_check_scales_baseline_by_calibration():
+    # 이 컴퓨터가 두 배 느리면 기준 10ms는 20ms로 본다
+    assert check_regressions(_results(25.0), BASELINE, 0.5) == [("100", "build_index", 25.0, 10.0)]
+    assert check_regressions(_results(25.0), BASELINE, 0.5, scale=2.0) == []
+    assert check_regressions(_results(31.0), BASELINE, 0.5, scale=2.0) == [("100", "build_index", 31.0, 20.0)]
+
+def test_load_baseline_reads_both_formats(tmp_path):
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps(BASELINE), encoding="utf-8")
+    assert load_baseline(str(path)) == (BASELINE, None, None)
+    document = baseline_document(BASELINE, 12.5)
+    path.write_text(json.dumps(document), encoding="utf-8")
+    assert load_baseline(str(path)) == (BASELINE, 12.5, document["machine"])
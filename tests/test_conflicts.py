@@ -0,0 +1,39 @@
+import itertools
+
+import pytest
+
+from schedule_core import UNASSIGNED_LOCATION, find_conflicts, split_staff
+
+# ==========================================
+# 충돌 검사: 모든 쌍을 직접 비교한 결과와 같은지
+# ==========================================
+def brute_force_conflicts(events):
+    """(건수, 이벤트 id 집합). 같은 장소(미정 제외)면 한 건, 아니면 겹치는 담당자마다 한 건."""
+    total = 0
+    ids = set()
+    for a, b in itertools.combinations(events, 2):
+        if not (a.setup < b.end and b.setup < a.end): continue
+        if a.location == b.location and a.location != UNASSIGNED_LOCATION: count = 1
+        else: count = len(set(split_staff(a.staff)) & set(split_staff(b.staff)))
+        total += count
+        if count: ids |= {a.id, b.id}
+    return total, ids
+
+@pytest.mark.parametrize("seed", range(20))
+def test_find_conflicts_matches_brute_force(seed, random_events):
+    events = random_events(seed)
+    total, ids = brute_force_conflicts(events)
+    report = find_conflicts(events, limit=len(events) ** 2)
+    assert report.total == total
+    assert report.event_ids == ids
+    assert len(report.conflicts) == total
+    assert [c.start for c in report.conflicts] == sorted(c.start for c in report.conflicts)
+
+def test_find_conflicts_limit_keeps_exact_total(random_events):
+    events = random_events(0, n=80)
+    total, ids = brute_force_conflicts(events)
+    report = find_conflicts(events, limit=5)
+    assert total > 5
+    assert len(report.conflicts) == 5
+    assert (report.total, report.event_ids) == (total, ids)
+    assert report.conflicts == find_conflicts(events, limit=len(events) ** 2).conflicts[:5]
@@ -0,0 +1,50 @@
+import json
+import os
+
+import pytest
+
+from schedule_core import delete_history, load_history_text, load_history_titles, save_to_history, search_history
+
+# ==========================================
+# 보관함 (SQLite): JSON 이관, 삭제
+# ==========================================
+def test_json_history_is_migrated_once(tmp_path, sample_text):
+    with open(tmp_path / "schedule_history.json", "w", encoding="utf-8") as f:
+        json.dump({"3월 2일 월요일": sample_text, "메모": "본문 없음"}, f, ensure_ascii=False)
+    db_path = str(tmp_path / "schedule_history.db")
+
+    assert sorted(load_history_titles(db_path)) == ["3월 2일 월요일", "메모"]
+    assert load_history_text("3월 2일 월요일", db_path) == sample_text
+    assert not os.path.exists(tmp_path / "schedule_history.json")
+    assert os.path.exists(tmp_path / "schedule_history.json.migrated")
+    # 이관한 본문도 검색 색인에 들어간다
+    assert search_history("홍길동", db_path=db_path) == ["3월 2일 월요일"]
+
+def test_delete_history_removes_body_and_index(tmp_path, sample_text):
+    db_path = str(tmp_path / "schedule_history.db")
+    title = save_to_history(sample_text, db_path)
+    delete_history(title, db_path)
+    assert load_history_titles(db_path) == []
+    assert load_history_text(title, db_path) is None
+    assert search_history("홍길동", db_path=db_path) == []
+
+# ==========================================
+# 보관함 검색
+# ==========================================
+@pytest.mark.parametrize("query, field", [
+    ("홍길동", None), ("길동", "담당자"), ("의원실", "의원실"), ("김의원", None), ("소회의실", "장소"),
+    ("세미나실", "장소"), ("제1", "장소"), ("토론회", "제목"), ("월요일", "보관함"), ("정책 토론", None),
+])
+def test_search_history_finds_saved_schedule(tmp_path, sample_text, query, field):
+    db_path = str(tmp_path / "schedule_history.db")
+    title = save_to_history(sample_text, db_path)
+    assert title == "3월 2일 월요일"
+    assert search_history(query, field, db_path) == [title]
+
+def test_search_history_requires_every_word(tmp_path, sample_text):
+    db_path = str(tmp_path / "schedule_history.db")
+    save_to_history(sample_text, db_path)
+    assert search_history("홍길동 없는사람", db_path=db_path) == []
+    assert search_history("홍길동", "장소", db_path) == []
+    # 빈 검색어는 전체 목록
+    assert search_history("  ", db_path=db_path) == ["3월 2일 월요일"]
@@ -0,0 +1,17 @@
+import schedule_cli
+
+SECTION = "3.2(월) 10시0분/9시30분\n제1소회의실 - 홍길동\n김의원실 / 이영희\n정책 토론회"
+
+def test_reads_cp949_file(tmp_path, capsys):
+    path = tmp_path / "schedule.txt"
+    path.write_bytes(SECTION.encode("cp949"))
+    assert schedule_cli.main([str(path), "--at", "2026-03-02 09:45"]) == 0
+    assert "제1소회의실" in capsys.readouterr().out
+
+def test_undecodable_file_is_a_clean_error(tmp_path, capsys):
+    path = tmp_path / "schedule.txt"
+    path.write_bytes(b"\xff\xfe\x00\xd8\xff")
+    assert schedule_cli.main([str(path)]) == 1
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err.startswith("인코딩 오류:")
@@ -0,0 +1,38 @@
+import datetime
+
+import pytest
+
+from schedule_core import ScheduleIndex
+
+# ==========================================
+# 장소 상태: 예전 app.py의 행 전체 훑기 규칙과 같은지
+# ==========================================
+def old_location_status(rows, location, now):
+    has_on_air = has_setting = has_imminent = False
+    all_finished = True
+    for row in rows:
+        if row['Task'] != location: continue
+        start, finish = row['Start'], row['Finish']
+        if finish > now: all_finished = False
+        if start <= now < finish:
+            if row['Resource'] == "본행사": has_on_air = True
+            elif row['Resource'] == "셋팅": has_setting = True
+        if row['Resource'] == "셋팅" and start - datetime.timedelta(minutes=30) <= now < start: has_imminent = True
+    if has_on_air: return "ON AIR"
+    if has_setting: return "셋팅중"
+    if has_imminent: return "셋팅임박"
+    if all_finished: return "종료"
+    return "대기"
+
+@pytest.mark.parametrize("seed", range(5))
+def test_location_status_matches_old_rule(seed, random_events):
+    events = random_events(seed)
+    rows = [row for event in events for row in event.bars()]
+    index = ScheduleIndex(rows)
+    # 첫 셋팅 1시간 전부터 5분 간격 (막대 경계가 모두 10분 격자라 경계 시각도 지나간다)
+    first = min(event.setup for event in events) - datetime.timedelta(hours=1)
+    for step in range(14 * 12):
+        now = first + datetime.timedelta(minutes=5 * step)
+        statuses = index.location_statuses(now)
+        for location in index.locations:
+            assert statuses[location] == old_location_status(rows, location, now), (location, now)
@@ -0,0 +1,47 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from static_server import StaticServer
+
+@pytest.fixture
+def server(tmp_path):
+    (tmp_path / "clip.wav").write_bytes(b"RIFF" + bytes(range(96)))
+    (tmp_path / "clip.mp3").write_bytes(b"ID3" + bytes(17))
+    (tmp_path / "index.html").write_text("<p>안내</p>", encoding="utf-8")
+    server = StaticServer(str(tmp_path), "127.0.0.1", 0, name="test", cache_control="max-age=60").start()
+    assert server.error is None and server.running
+    yield server
+    server.stop()
+
+def _get(server, name, headers=None):
+    request = urllib.request.Request(f"{server.url()}{name}", headers=headers or {})
+    with urllib.request.urlopen(request) as response: return response.status, response.headers, response.read()
+
+def test_audio_and_html_get_real_content_types(server):
+    assert _get(server, "clip.wav")[1]["Content-Type"] == "audio/wav"
+    assert _get(server, "clip.mp3")[1]["Content-Type"] == "audio/mpeg"
+    status, headers, body = _get(server, "")
+    assert headers["Content-Type"].startswith("text/html")
+    assert body.decode("utf-8") == "<p>안내</p>"
+    assert headers["Cache-Control"] == "max-age=60"
+
+def test_byte_range_request(server):
+    status, headers, body = _get(server, "clip.wav", {"Range": "bytes=4-9"})
+    assert status == 206
+    assert headers["Content-Range"] == "bytes 4-9/100"
+    assert body == bytes(range(6))
+    status, headers, body = _get(server, "clip.wav", {"Range": "bytes=-3"})
+    assert (status, body) == (206, bytes([93, 94, 95]))
+
+def test_missing_file_is_not_cached(server):
+    with pytest.raises(urllib.error.HTTPError) as error: _get(server, "missing.wav")
+    assert error.value.code == 404
+    assert error.value.headers["Cache-Control"] == "no-store"
+
+def test_stop_closes_port(server):
+    url = server.url()
+    server.stop()
+    assert not server.running
+    with pytest.raises(urllib.error.URLError): urllib.request.urlopen(url, timeout=2)
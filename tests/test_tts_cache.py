@@ -0,0 +1,109 @@
+import asyncio
+import datetime
+import os
+import time
+import wave
+
+import tts_cache
+from schedule_core import parse_section
+from tts_cache import LocalTTSBackend, TTSCache, TTSPregenerator, announcement_schedule
+
+def _wait(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "시간 초과"
+        time.sleep(0.01)
+
+class FailingBackend(LocalTTSBackend):
+    """합성할 때마다 실패하고 호출 횟수를 센다 (오프라인 edge-tts 대역)."""
+    name = "failing"
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def synthesize(self, text, path):
+        self.calls += 1
+        raise ConnectionError("offline")
+
+# ==========================================
+# 안내 목록
+# ==========================================
+def test_announcement_keys_change_with_the_day():
+    # 날짜(M.D)가 없는 섹션은 오늘로 읽혀 날마다 같은 id가 된다
+    section = "10시/9시30분\n제1소회의실 - 홍길동\n김의원실 / 이영희\n정책 토론회"
+    first, second = (parse_section(section, datetime.date(2026, 3, day)) for day in (2, 3))
+    assert first.id == second.id
+    keys = [{item["key"] for item in announcement_schedule([event.js_event()])} for event in (first, second)]
+    assert len(keys[0]) == 2
+    assert not keys[0] & keys[1]
+
+# ==========================================
+# 디스크 캐시
+# ==========================================
+def test_generate_writes_wav_once(tmp_path):
+    cache = TTSCache(str(tmp_path), LocalTTSBackend())
+    assert cache.lookup("안내") is None
+    asyncio.run(cache.generate("안내"))
+
+    path = cache.lookup("안내")
+    assert path == cache.path("안내")
+    with wave.open(path, "rb") as clip: assert clip.getnframes() > 0
+    assert cache.url("안내", "http://lobby:8503/") == f"http://lobby:8503/{os.path.basename(path)}"
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".part")] == []
+
+    # 이미 있으면 다시 합성하지 않는다
+    os.utime(path, (1, 1))
+    asyncio.run(cache.generate("안내"))
+    assert os.path.getmtime(path) > 1
+
+def test_filename_depends_on_backend_and_text(tmp_path):
+    cache = TTSCache(str(tmp_path), LocalTTSBackend())
+    failing = TTSCache(str(tmp_path), FailingBackend())
+    assert cache.filename("가") != cache.filename("나")
+    assert cache.filename("가") != failing.filename("가")
+
+def test_evict_removes_least_recently_used(tmp_path):
+    cache = TTSCache(str(tmp_path), LocalTTSBackend())
+    for text in ("첫째 안내", "둘째 안내"): asyncio.run(cache.generate(text))
+    size = os.path.getsize(cache.path("첫째 안내"))
+    cache.max_bytes = size * 2
+    old = time.time() - 60
+    os.utime(cache.path("첫째 안내"), (old, old))
+    os.utime(cache.path("둘째 안내"), (old + 10, old + 10))
+
+    # 먼저 만든 클립이라도 최근에 찾았으면 남는다
+    assert cache.lookup("첫째 안내")
+    asyncio.run(cache.generate("셋째 안내"))
+    assert cache.lookup("첫째 안내")
+    assert cache.lookup("셋째 안내")
+    assert cache.lookup("둘째 안내") is None
+
+# ==========================================
+# 백그라운드 사전 합성
+# ==========================================
+def test_pregenerator_synthesizes_and_skips_cached(tmp_path):
+    cache = TTSCache(str(tmp_path), LocalTTSBackend())
+    pregenerator = TTSPregenerator(cache, workers=2)
+    assert pregenerator.submit([(2, "둘째"), (1, "첫째"), (1, "첫째")]) == 2
+    _wait(lambda: pregenerator.pending() == 0)
+    assert cache.lookup("첫째") and cache.lookup("둘째")
+    assert pregenerator.submit([(1, "첫째"), (2, "둘째")]) == 0
+
+def test_pregenerator_backs_off_after_failure(tmp_path):
+    backend = FailingBackend()
+    pregenerator = TTSPregenerator(TTSCache(str(tmp_path), backend), workers=1)
+    assert pregenerator.submit([(1, "안내")]) == 1
+    _wait(lambda: pregenerator.pending() == 0)
+    assert backend.calls == 1
+
+    # 대기 시간 안에는 다시 넣지 않는다
+    assert pregenerator.submit([(1, "안내")]) == 0
+    # 대기 시간이 지나면 다시 시도하고, 다음 대기는 두 배
+    retry_at, delay = pregenerator._failed["안내"]
+    assert retry_at > time.monotonic() and delay == tts_cache.TTS_RETRY_SECONDS * 2
+    pregenerator._failed["안내"] = (time.monotonic() - 1, delay)
+    assert pregenerator.submit([(1, "안내")]) == 1
+    _wait(lambda: pregenerator.pending() == 0)
+    assert backend.calls == 2
+    assert pregenerator._failed["안내"][1] == tts_cache.TTS_RETRY_SECONDS * 4
@@ -0,0 +1,48 @@
+import datetime
+import json
+
+from conftest import DAY, at_minutes
+from schedule_core import USAGE_LEAD_BINS, Event, history_title, save_history_entries, usage_rows, usage_summary
+
+PERIOD = (datetime.date(2000, 1, 1), datetime.date(2100, 12, 31))
+
+def _event(setup, start, end, location="제1소회의실", staff="홍길동"):
+    return Event("e", DAY, setup, start, end, location, staff, "김의원실", "", "토론회", "")
+
+def _rows(events, kind):
+    return {key: value for _, row_kind, key, _, value in usage_rows(events) if row_kind == kind}
+
+# ==========================================
+# 보관함 사용 현황
+# ==========================================
+def test_same_date_saved_twice_counts_once(tmp_path, sample_text):
+    title, schedule_date = history_title(sample_text)
+    single, double = str(tmp_path / "single.db"), str(tmp_path / "double.db")
+    save_history_entries([(title, sample_text, schedule_date, None)], single)
+    # 같은 날짜를 수정본 제목으로 한 번 더 저장
+    save_history_entries([(title, sample_text, schedule_date, None), (f"{title} (수정)", sample_text, schedule_date, None)], double)
+
+    for kind in ("장소", "담당자"):
+        once, twice = (usage_summary(*PERIOD, kind=kind, db_path=db_path) for db_path in (single, double))
+        assert twice["totals"] == once["totals"]
+        assert twice["lead"] == once["lead"]
+        assert twice["days"] == once["days"] == 1
+    summary = usage_summary(*PERIOD, keys=["제1소회의실"], db_path=double)
+    assert summary["totals"] == {"제1소회의실": 2.5}
+    assert max(max(row) for row in summary["heatmap"]) == 1.0
+
+def test_occupancy_is_clipped_at_midnight():
+    # 23시 셋팅, 23시 30분 시작, 다음 날 1시 30분 종료
+    event = _event(at_minutes(23 * 60), at_minutes(23 * 60 + 30), at_minutes(23 * 60 + 30) + datetime.timedelta(hours=2))
+    mask = int(_rows([event], "장소")["제1소회의실"], 16)
+    assert mask.bit_length() == 1440
+    assert bin(mask).count("1") == 60
+    assert mask == ((1 << 60) - 1) << (23 * 60)
+
+def test_long_lead_times_fall_in_last_bin():
+    start = at_minutes(14 * 60)
+    events = [_event(start - datetime.timedelta(minutes=lead), start, start + datetime.timedelta(hours=1)) for lead in (0, 119, 120, 300)]
+    bins = json.loads(_rows(events, "장소:셋팅")["제1소회의실"])
+    assert len(bins) == USAGE_LEAD_BINS
+    assert bins[0] == 1 and bins[11] == 1 and bins[-1] == 2
+    assert sum(bins) == len(events)
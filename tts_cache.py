@@ -0,0 +1,226 @@
+import asyncio
+import hashlib
+import logging
+import os
+import struct
+import threading
+import time
+import wave
+
+# ==========================================
+# 1. 안내 문구 (브라우저 안내와 같은 문장)
+# ==========================================
+VOICE = "ko-KR-SunHiNeural"
+ANNOUNCE_LEAD_MS = 5 * 60 * 1000
+
+TTS_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "tts")
+# 클립은 Streamlit 정적 서빙(.mp3/.wav를 text/plain으로 보냄) 대신 static_server로 제공. 포트를 비우면 브라우저 음성만 쓴다
+# (Streamlit을 https로 열면 http 클립은 혼합 콘텐츠로 막혀 브라우저 음성으로 대체된다)
+TTS_SERVER_HOST = os.environ.get("SEMINAR_TTS_HOST", "0.0.0.0")
+TTS_SERVER_PORT = os.environ.get("SEMINAR_TTS_PORT", "8503")
+TTS_CACHE_MAX_BYTES = 200 * 1024 * 1024
+TTS_WORKERS = 3
+# 합성에 실패한 문장은 이만큼 기다렸다가 다시 시도 (실패할 때마다 두 배, 최대 TTS_RETRY_MAX_SECONDS)
+TTS_RETRY_SECONDS = 60
+TTS_RETRY_MAX_SECONDS = 30 * 60
+# 탭이 백그라운드에서 잠들어 발화 시각을 놓쳤을 때, 이 시간 안이면 늦게라도 안내
+ANNOUNCE_GRACE_MS = int(float(os.environ.get("SEMINAR_ANNOUNCE_GRACE_SECONDS", "90")) * 1000)
+
+logger = logging.getLogger(__name__)
+
+def announcement_text(event, kind):
+    if kind == "5min": return f"{event['location']}, 셋팅 시작 5분 전입니다. {event['staff']} 준비해 주세요."
+    return f"{event['location']}, 셋팅 시작 시간입니다. {event['staff']} 준비해 주세요."
+
+def announcement_schedule(js_events):
+    """이벤트별 안내 목록 [{at, key, text}]. key는 이벤트 id 기준이라 한 장소에 세션이 둘이어도 겹치지 않는다.
+    id(섹션 내용 해시)에는 날짜가 없으므로 셋팅 시각도 넣는다 (날짜 없는 섹션은 매일 같은 id라 다음 날 안내가 '이미 울림'으로 남지 않도록)."""
+    schedule = []
+    for event in js_events:
+        for kind, fire_ms in (("5min", event['setup_ts'] - ANNOUNCE_LEAD_MS), ("exact", event['setup_ts'])):
+            schedule.append({"at": fire_ms, "key": f"{event['id']}_{int(event['setup_ts'])}_{kind}", "text": announcement_text(event, kind)})
+    return schedule
+
+def upcoming_announcements(js_events, now_ms):
+    """아직 울리지 않은 안내를 발화 시각 순으로."""
+    return sorted((item for item in announcement_schedule(js_events) if item["at"] >= now_ms), key=lambda item: item["at"])
+
+# ==========================================
+# 2. 합성 백엔드 (교체 가능)
+# ==========================================
+class EdgeTTSBackend:
+    name = "edge"
+    extension = "mp3"
+
+    def __init__(self, voice=VOICE):
+        self.voice = voice
+
+    async def synthesize(self, text, path):
+        import edge_tts
+        communicate = edge_tts.Communicate(text, self.voice)
+        await communicate.save(path)
+
+class LocalTTSBackend:
+    """네트워크 없이 동작하는 대체 합성기. 문장 길이에 비례하는 짧은 신호음 WAV를 만든다 (오프라인 테스트용)."""
+    name = "local"
+    extension = "wav"
+    voice = "beep"
+
+    def __init__(self, sample_rate=8000):
+        self.sample_rate = sample_rate
+
+    async def synthesize(self, text, path):
+        frames = int(self.sample_rate * min(0.05 * len(text), 3.0))
+        with wave.open(path, "wb") as out:
+            out.setnchannels(1); out.setsampwidth(2); out.setframerate(self.sample_rate)
+            tone = b"".join(struct.pack("<h", 8000 if (i // 10) % 2 else -8000) for i in range(frames))
+            out.writeframes(tone)
+
+BACKENDS = {"edge": EdgeTTSBackend, "local": LocalTTSBackend}
+
+def register_backend(name, factory):
+    BACKENDS[name] = factory
+
+def get_backend(name=None):
+    name = name or os.environ.get("SEMINAR_TTS_BACKEND", "edge")
+    return BACKENDS[name]()
+
+# ==========================================
+# 3. 내용 주소 디스크 캐시 (LRU 삭제)
+# ==========================================
+class TTSCache:
+    def __init__(self, directory=TTS_CACHE_DIR, backend=None, max_bytes=TTS_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.backend = backend or get_backend()
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def filename(self, text):
+        digest = hashlib.sha256(f"{self.backend.name}|{self.backend.voice}|{text}".encode("utf-8")).hexdigest()
+        return f"{digest}.{self.backend.extension}"
+
+    def path(self, text):
+        return os.path.join(self.directory, self.filename(text))
+
+    def url(self, text, base_url):
+        # 파일 이름이 내용으로 정해지므로 합성 전에도 URL을 알 수 있다
+        return f"{base_url}{self.filename(text)}"
+
+    def lookup(self, text):
+        path = self.path(text)
+        try: os.utime(path)  # 최근 사용 시각 갱신 (LRU)
+        except FileNotFoundError: return None
+        return path
+
+    def evict(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.endswith(".part"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes: break
+            try: os.remove(path); total -= size
+            except FileNotFoundError: pass
+
+    async def generate(self, text):
+        if self.lookup(text): return
+        path = self.path(text)
+        part = f"{path}.part"
+        try:
+            await self.backend.synthesize(text, part)
+            os.replace(part, path)
+        finally:
+            if os.path.exists(part): os.remove(part)
+        self.evict()
+
+# ==========================================
+# 4. 백그라운드 사전 합성 (asyncio 워커 풀)
+# ==========================================
+class TTSPregenerator:
+    def __init__(self, cache, workers=TTS_WORKERS, server=None):
+        self.cache = cache
+        self.workers = workers
+        # 캐시 폴더를 제공하는 static_server.StaticServer (없으면 클립 없이 브라우저 음성만)
+        self.server = server
+        self._pending = set()
+        # 문장 -> (다시 시도할 시각 monotonic, 다음 대기 초). 오프라인일 때 재실행마다 다시 넣고 경고를 쌓지 않도록
+        self._failed = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="tts-pregenerate", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        # 발화 시각이 가까운 문장부터 합성 (우선순위 큐 = 힙)
+        self._queue = asyncio.PriorityQueue()
+        for _ in range(self.workers): self._loop.create_task(self._worker())
+        self._loop.call_soon(self._ready.set)
+        self._loop.run_forever()
+
+    async def _worker(self):
+        while True:
+            _, _, text = await self._queue.get()
+            try:
+                await self.cache.generate(text)
+                with self._lock: self._failed.pop(text, None)
+            except Exception:
+                with self._lock:
+                    delay = self._failed.get(text, (0, TTS_RETRY_SECONDS))[1]
+                    self._failed[text] = (time.monotonic() + delay, min(delay * 2, TTS_RETRY_MAX_SECONDS))
+                logger.warning("TTS 합성 실패 (%d초 뒤 다시 시도): %s", delay, text, exc_info=True)
+            finally:
+                with self._lock: self._pending.discard(text)
+                self._queue.task_done()
+
+    def submit(self, items):
+        """(발화 시각 ms, 문장) 중 아직 캐시에 없는 문장만 큐에 넣는다 (이미 대기 중이거나 실패 후 대기 중인 문장은 무시). 호출은 바로 반환.
+        이미 있는 클립은 lookup으로 사용 시각을 갱신해 곧 울릴 안내가 LRU 삭제 대상이 되지 않게 한다."""
+        queued = 0
+        now = time.monotonic()
+        for fire_ms, text in items:
+            with self._lock:
+                if text in self._pending: continue
+                if text in self._failed and self._failed[text][0] > now: continue
+                if self.cache.lookup(text): continue
+                self._pending.add(text)
+                self._seq += 1
+                entry = (fire_ms, self._seq, text)
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, entry)
+            queued += 1
+        return queued
+
+    def pending(self):
+        with self._lock: return len(self._pending)
+
+    def pregenerate(self, js_events, now_ms, host=None):
+        """다가오는 안내 문장을 발화 시각 순으로 합성 요청하고, 문장 -> 클립 URL 맵을 돌려준다.
+        host는 브라우저가 접속한 서버 이름. 맵은 스케줄과 host에만 의존하므로 재실행마다 같은 값이다 (클라이언트 iframe이 다시 로드되지 않음).
+        클립 서버가 없으면 합성하지 않고 빈 맵 (브라우저 음성)."""
+        if self.server is None or not self.server.running: return {}
+        self.submit((item["at"], item["text"]) for item in upcoming_announcements(js_events, now_ms))
+        base_url = self.server.url(host)
+        return {item["text"]: self.cache.url(item["text"], base_url) for item in announcement_schedule(js_events)}
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_tts_service():
+    """프로세스 전체에서 하나의 사전 합성기와 클립 서버를 공유 (Streamlit 재실행 사이에도 유지)."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            from static_server import StaticServer
+            cache = TTSCache()
+            server = None
+            if TTS_SERVER_PORT:
+                server = StaticServer(cache.directory, TTS_SERVER_HOST, int(TTS_SERVER_PORT), name="tts", cache_control="max-age=86400").start()
+                if server.error: logger.warning("%s (브라우저 음성으로 대체)", server.error)
+            _service = TTSPregenerator(cache, server=server)
+        return _service